@@ -0,0 +1,194 @@
+import io
+from array import array
+
+from htmlnode import LeafNode, ParentNode
+
+
+class ArenaTree:
+    def __init__(self):
+        self.tags = [None]
+        self.tag_ids = {None: 0}
+        self.tag_id = array("H")
+        self.parent = array("i")
+        self.first_child = array("i")
+        self.next_sibling = array("i")
+        self.last_child = array("i")
+        self.value_start = array("q")
+        self.value_end = array("q")
+        self.props = {}
+        self.buffer = io.StringIO()
+        self.length = 0
+        self.text = None
+        self.stack = []
+
+    def __len__(self):
+        return len(self.tag_id)
+
+    def add(self, tag, value=None, props=None):
+        index = len(self.tag_id)
+        tag_id = self.tag_ids.get(tag)
+        if tag_id is None:
+            tag_id = len(self.tags)
+            self.tags.append(tag)
+            self.tag_ids[tag] = tag_id
+        parent = self.stack[-1] if self.stack else -1
+        self.tag_id.append(tag_id)
+        self.parent.append(parent)
+        self.first_child.append(-1)
+        self.next_sibling.append(-1)
+        self.last_child.append(-1)
+        if value is None:
+            self.value_start.append(-1)
+            self.value_end.append(-1)
+        else:
+            self.value_start.append(self.length)
+            self.length += self.buffer.write(value)
+            self.value_end.append(self.length)
+        if props:
+            self.props[index] = tuple(props.items())
+        if parent != -1:
+            last = self.last_child[parent]
+            if last == -1:
+                self.first_child[parent] = index
+            else:
+                self.next_sibling[last] = index
+            self.last_child[parent] = index
+        return index
+
+    def open(self, tag, props=None):
+        self.stack.append(self.add(tag, None, props))
+
+    def close(self):
+        self.stack.pop()
+
+    def leaf(self, tag, value, props=None):
+        return self.add(tag, value, props)
+
+    def append_leaf(self, node):
+        return self.add(node.tag, node.value, node.props)
+
+    def append_node(self, node):
+        if node.children is None:
+            return self.append_leaf(node)
+        index = self.add(node.tag, None, node.props)
+        self.stack.append(index)
+        for child in node.children:
+            self.append_node(child)
+        self.stack.pop()
+        return index
+
+    def finish(self):
+        if self.stack:
+            raise ValueError("invalid tree: unclosed nodes")
+        self.text = self.buffer.getvalue()
+        self.buffer = None
+        self.last_child = None
+        return ArenaNode(self, 0)
+
+    def value(self, index):
+        start = self.value_start[index]
+        if start == -1:
+            return None
+        return self.text[start : self.value_end[index]]
+
+    def children(self, index):
+        child = self.first_child[index]
+        while child != -1:
+            yield child
+            child = self.next_sibling[child]
+
+    def start_tag(self, index):
+        tag = self.tags[self.tag_id[index]]
+        props = self.props.get(index)
+        if props is None:
+            return f"<{tag}>"
+        attributes = "".join(f' {prop}="{value}"' for prop, value in props)
+        return f"<{tag}{attributes}>"
+
+    def iter_html(self, index=0):
+        value = self.value(index)
+        if value is not None:
+            yield self.leaf_html(index, value)
+            return
+        yield self.start_tag(index)
+        stack = [(index, self.first_child[index])]
+        while stack:
+            parent, child = stack[-1]
+            if child == -1:
+                stack.pop()
+                yield f"</{self.tags[self.tag_id[parent]]}>"
+                continue
+            stack[-1] = (parent, self.next_sibling[child])
+            value = self.value(child)
+            if value is not None:
+                yield self.leaf_html(child, value)
+            else:
+                yield self.start_tag(child)
+                stack.append((child, self.first_child[child]))
+
+    def leaf_html(self, index, value):
+        tag = self.tags[self.tag_id[index]]
+        if tag is None:
+            return value
+        return f"{self.start_tag(index)}{value}</{tag}>"
+
+
+class ArenaNode:
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree, index):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def tag(self):
+        return self.tree.tags[self.tree.tag_id[self.index]]
+
+    @property
+    def value(self):
+        return self.tree.value(self.index)
+
+    @property
+    def props(self):
+        props = self.tree.props.get(self.index)
+        return dict(props) if props is not None else None
+
+    @property
+    def children(self):
+        if self.tree.value_start[self.index] != -1:
+            return None
+        return [ArenaNode(self.tree, child) for child in self.tree.children(self.index)]
+
+    @property
+    def parent(self):
+        parent = self.tree.parent[self.index]
+        if parent == -1:
+            return None
+        return ArenaNode(self.tree, parent)
+
+    def to_html(self):
+        return "".join(self.iter_html())
+
+    def iter_html(self):
+        return self.tree.iter_html(self.index)
+
+    def write_html(self, fp):
+        fp.writelines(self.iter_html())
+
+    def to_node(self):
+        value = self.value
+        if value is not None:
+            return LeafNode(self.tag, value, self.props)
+        children = [child.to_node() for child in self.children]
+        return ParentNode(self.tag, children, self.props)
+
+    def __eq__(self, other):
+        if not isinstance(other, ArenaNode):
+            return NotImplemented
+        return self.tree is other.tree and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self):
+        return f"ArenaNode({self.tag}, {self.index})"
@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+
+from copystatic import make_dirs, place_file
+from manifest import hash_file
+from output_writer import write_output
+from plan import plan_assets
+
+FINGERPRINT_LENGTH = 8
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+
+
+class AssetManifest:
+    __slots__ = ("urls", "digest")
+
+    def __init__(self, urls):
+        self.urls = dict(urls)
+        encoded = json.dumps(self.urls, sort_keys=True).encode()
+        self.digest = hashlib.sha256(encoded).hexdigest()
+
+    def get(self, url, default=None):
+        return self.urls.get(url, default)
+
+    def __eq__(self, other):
+        if not isinstance(other, AssetManifest):
+            return NotImplemented
+        return self.digest == other.digest
+
+    def __hash__(self):
+        return hash(self.digest)
+
+    def __repr__(self):
+        return f"AssetManifest({self.urls})"
+
+
+def fingerprint_name(filename, digest):
+    stem, extension = os.path.splitext(filename)
+    return f"{stem}.{digest[:FINGERPRINT_LENGTH]}{extension}"
+
+
+def fingerprint_assets(
+    source_dir_path, dest_dir_path, manifest=None, link_mode="copy", url_prefix="/"
+):
+    assets = plan_assets(source_dir_path, dest_dir_path)
+    return fingerprint_files(assets, dest_dir_path, manifest, link_mode, url_prefix)
+
+
+def fingerprint_files(
+    assets, dest_dir_path, manifest=None, link_mode="copy", url_prefix="/"
+):
+    make_dirs(dest_dir_path, [os.path.dirname(dest_path) for _, dest_path, _ in assets])
+    urls = {}
+    for from_path, dest_path, _ in assets:
+        dir_path, filename = os.path.split(dest_path)
+        fingerprinted_path = os.path.join(
+            dir_path, fingerprint_name(filename, hash_file(from_path))
+        )
+        if manifest is not None:
+            manifest.record_asset(fingerprinted_path, from_path)
+        url = url_prefix + os.path.relpath(dest_path, dest_dir_path)
+        fingerprinted_url = url_prefix + os.path.relpath(
+            fingerprinted_path, dest_dir_path
+        )
+        urls[url.replace(os.sep, "/")] = fingerprinted_url.replace(os.sep, "/")
+        if not os.path.exists(fingerprinted_path):
+            print(f" * {from_path} -> {fingerprinted_path}")
+            place_file(from_path, fingerprinted_path, link_mode)
+    return AssetManifest(urls)
+
+
+def write_asset_manifest(assets, dest_dir_path, manifest=None):
+    path = os.path.join(dest_dir_path, ASSET_MANIFEST_NAME)
+    write_output(path, [json.dumps(assets.urls, indent=2, sort_keys=True)])
+    if manifest is not None:
+        manifest.record_asset(path, path)
+    return path
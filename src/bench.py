@@ -0,0 +1,181 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import main as site
+from corpus import SHAPES, generate_site
+from generate_page import find_pages, generate_page
+from html_emitter import markdown_to_html
+from inline_markdown import text_to_textnodes
+from markdown_to_blocks import (
+    BlockType,
+    markdown_to_blocks,
+    markdown_to_html_node,
+    scan_blocks,
+)
+
+RESULT_VERSION = 1
+
+
+def time_stage(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return {"min": min(runs), "median": statistics.median(runs), "runs": runs}
+
+
+def inline_texts(markdown):
+    texts = []
+    for block in scan_blocks(markdown.split("\n")):
+        if block.block_type == BlockType.CODE:
+            continue
+        if block.block_type == BlockType.PARAGRAPH:
+            texts.append(" ".join(block.lines))
+        elif block.block_type == BlockType.HEADING:
+            texts.append(block.text.lstrip("#")[1:])
+        elif block.block_type == BlockType.QUOTE:
+            texts.append(" ".join(line.lstrip(">").strip() for line in block.lines))
+        elif block.block_type == BlockType.ULIST:
+            texts.extend(line[2:] for line in block.lines)
+        elif block.block_type == BlockType.OLIST:
+            texts.extend(line.split(". ", 1)[1] for line in block.lines)
+    return texts
+
+
+def run_benchmarks(shape="many-small", pages=100, repeat=5, seed=0, build_args=None):
+    with tempfile.TemporaryDirectory() as root:
+        generate_site(root, shape, pages, seed)
+        content = os.path.join(root, "content")
+        template = os.path.join(root, "template.html")
+        docs = os.path.join(root, "docs")
+        page_paths = find_pages(content, docs)
+        markdowns = []
+        for from_path, _ in page_paths:
+            with open(from_path) as f:
+                markdowns.append(f.read())
+        texts = [text for markdown in markdowns for text in inline_texts(markdown)]
+        nodes = [markdown_to_html_node(markdown) for markdown in markdowns]
+
+        def generate_pages():
+            for from_path, dest_path in page_paths:
+                generate_page(from_path, template, dest_path)
+
+        def build():
+            cwd = os.getcwd()
+            os.chdir(root)
+            try:
+                site.main(build_args or [])
+            finally:
+                os.chdir(cwd)
+
+        stages = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            stages["markdown_to_blocks"] = time_stage(
+                lambda: [markdown_to_blocks(markdown) for markdown in markdowns], repeat
+            )
+            stages["text_to_textnodes"] = time_stage(
+                lambda: [text_to_textnodes(text) for text in texts], repeat
+            )
+            stages["markdown_to_html_node"] = time_stage(
+                lambda: [markdown_to_html_node(markdown) for markdown in markdowns],
+                repeat,
+            )
+            stages["to_html"] = time_stage(
+                lambda: [node.to_html() for node in nodes], repeat
+            )
+            stages["markdown_to_html"] = time_stage(
+                lambda: [markdown_to_html(markdown) for markdown in markdowns], repeat
+            )
+            stages["generate_page"] = time_stage(generate_pages, repeat)
+            stages["build"] = time_stage(build, repeat)
+
+    return {
+        "version": RESULT_VERSION,
+        "python": platform.python_version(),
+        "shape": shape,
+        "pages": len(page_paths),
+        "seed": seed,
+        "corpus_bytes": sum(len(markdown) for markdown in markdowns),
+        "build_args": build_args or [],
+        "stages": stages,
+    }
+
+
+def compare(result, baseline, threshold=0.1):
+    regressions = []
+    for name, stage in result["stages"].items():
+        if name not in baseline["stages"]:
+            continue
+        before = baseline["stages"][name]["min"]
+        after = stage["min"]
+        if before > 0 and after > before * (1 + threshold):
+            regressions.append((name, before, after))
+    return regressions
+
+
+def print_result(result, baseline=None):
+    print(f"{result['shape']}: {result['pages']} pages, {result['corpus_bytes']} bytes")
+    for name, stage in result["stages"].items():
+        line = f"  {name:<22} {stage['min'] * 1000:10.2f} ms"
+        if baseline is not None and name in baseline["stages"]:
+            before = baseline["stages"][name]["min"]
+            if before > 0:
+                line += f"  ({(stage['min'] / before - 1) * 100:+.1f}%)"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the site generator")
+    parser.add_argument("--shape", choices=list(SHAPES), default="many-small")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the JSON result to this file")
+    parser.add_argument("--baseline", help="JSON result to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed slowdown against the baseline before failing (0.1 = 10%%)",
+    )
+    parser.add_argument(
+        "build_args",
+        nargs=argparse.REMAINDER,
+        help="arguments passed to main.py for the full build stage, after --",
+    )
+    args = parser.parse_args(argv)
+    build_args = [arg for arg in args.build_args if arg != "--"]
+
+    result = run_benchmarks(args.shape, args.pages, args.repeat, args.seed, build_args)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_result(result, baseline)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(result, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(
+                f"regression: {name} {before * 1000:.2f} ms -> {after * 1000:.2f} ms",
+                file=sys.stderr,
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+RENDERER_VERSION = "2"
+
+open_caches = {}
+
+
+class BlockCache:
+    def __init__(self, cache_dir_path=None, memory_items=4096, disk_bytes=64 << 20):
+        self.cache_dir_path = cache_dir_path
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_usage = None
+        self.lock = threading.RLock()
+
+    def __reduce__(self):
+        return (
+            open_block_cache,
+            (self.cache_dir_path, self.memory_items, self.disk_bytes),
+        )
+
+    def key(self, block):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(RENDERER_VERSION.encode())
+        digest.update(block.block_type.value.encode())
+        for line in block.lines:
+            digest.update(b"\n")
+            digest.update(line.encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            html = self.memory.get(key)
+            if html is not None:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return html
+        html = self.read_disk(key)
+        with self.lock:
+            if html is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.remember(key, html)
+        return html
+
+    def put(self, key, html):
+        self.remember(key, html)
+        self.write_disk(key, html)
+
+    def remember(self, key, html):
+        with self.lock:
+            self.memory[key] = html
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.memory_items:
+                self.memory.popitem(last=False)
+
+    def disk_path(self, key):
+        return os.path.join(self.cache_dir_path, key[:2], key[2:] + ".html")
+
+    def read_disk(self, key):
+        if self.cache_dir_path is None:
+            return None
+        path = self.disk_path(key)
+        try:
+            with open(path, "r") as f:
+                html = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return html
+
+    def write_disk(self, key, html):
+        if self.cache_dir_path is None:
+            return
+        path = self.disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(html)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        with self.lock:
+            if self.disk_usage is None:
+                self.disk_usage = sum(size for _, size, _ in self.disk_entries())
+            else:
+                self.disk_usage += len(html.encode())
+            if self.disk_usage > self.disk_bytes:
+                self.trim()
+
+    def disk_entries(self):
+        entries = []
+        if self.cache_dir_path is None or not os.path.isdir(self.cache_dir_path):
+            return entries
+        for shard in os.scandir(self.cache_dir_path):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(".html"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        return entries
+
+    def trim(self, target_bytes=None):
+        if target_bytes is None:
+            target_bytes = self.disk_bytes * 9 // 10
+        with self.lock:
+            entries = self.disk_entries()
+            usage = sum(size for _, size, _ in entries)
+            for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+                if usage <= target_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                usage -= size
+            self.disk_usage = usage
+        return usage
+
+
+def open_block_cache(cache_dir_path=None, memory_items=4096, disk_bytes=64 << 20):
+    key = (cache_dir_path, memory_items, disk_bytes)
+    if key not in open_caches:
+        open_caches[key] = BlockCache(cache_dir_path, memory_items, disk_bytes)
+    return open_caches[key]
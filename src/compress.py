@@ -0,0 +1,53 @@
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from manifest import hash_file
+
+COMPRESSIBLE_EXTENSIONS = (".html", ".css", ".svg", ".js")
+MIN_SIZE = 1024
+
+
+def write_gzip_sidecars(paths, manifest=None, min_size=MIN_SIZE, jobs=None):
+    candidates = []
+    for path in paths:
+        if not path.endswith(COMPRESSIBLE_EXTENSIONS):
+            continue
+        if os.path.getsize(path) < min_size:
+            continue
+        previous_hash = None
+        if manifest is not None:
+            previous_hash = manifest.sidecars.get(path + ".gz")
+        candidates.append((path, previous_hash))
+
+    written = []
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(lambda job: update_sidecar(*job), candidates)
+        for (path, _), (source_hash, was_written) in zip(candidates, results):
+            if manifest is not None:
+                manifest.record_sidecar(path + ".gz", source_hash)
+            if was_written:
+                written.append(path + ".gz")
+    return written
+
+
+def update_sidecar(path, previous_hash=None):
+    sidecar_path = path + ".gz"
+    source_hash = hash_file(path)
+    if source_hash == previous_hash and os.path.exists(sidecar_path):
+        return source_hash, False
+    gzip_file(path, sidecar_path)
+    return source_hash, True
+
+
+def gzip_file(path, sidecar_path=None):
+    if sidecar_path is None:
+        sidecar_path = path + ".gz"
+    with open(path, "rb") as f:
+        data = f.read()
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    tmp_path = sidecar_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(compressed)
+    os.replace(tmp_path, sidecar_path)
+    return len(compressed)
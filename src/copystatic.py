@@ -1,5 +1,17 @@
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from manifest import hash_file
+from plan import largest_first, plan_assets
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+LINK_MODES = ["copy", "hardlink", "reflink"]
+COPY_CHUNK_SIZE = 1 << 30
 
 
 def copy_files_recursive(source_dir_path, dest_dir_path):
@@ -14,3 +26,162 @@ def copy_files_recursive(source_dir_path, dest_dir_path):
             shutil.copy(from_path, dest_path)
         else:
             copy_files_recursive(from_path, dest_path)
+
+
+def sync_files_recursive(
+    source_dir_path,
+    dest_dir_path,
+    manifest=None,
+    checksum=False,
+    link_mode="copy",
+    workers=1,
+    verbose=False,
+):
+    assets = plan_assets(source_dir_path, dest_dir_path)
+    return sync_files(
+        assets, dest_dir_path, manifest, checksum, link_mode, workers, verbose
+    )
+
+
+def sync_files(
+    assets,
+    dest_dir_path,
+    manifest=None,
+    checksum=False,
+    link_mode="copy",
+    workers=1,
+    verbose=False,
+):
+    if link_mode not in LINK_MODES:
+        raise ValueError(f"invalid link mode: {link_mode}")
+    if workers < 1:
+        raise ValueError(f"invalid number of copy workers: {workers}")
+    make_dirs(dest_dir_path, [os.path.dirname(dest_path) for _, dest_path, _ in assets])
+    if manifest is not None:
+        for from_path, dest_path, _ in assets:
+            manifest.record_asset(dest_path, from_path)
+
+    def sync(asset):
+        from_path, dest_path, from_stat = asset
+        if is_up_to_date(from_path, dest_path, checksum, from_stat):
+            return False
+        if verbose:
+            print(f" * {from_path} -> {dest_path}")
+        if os.path.isdir(dest_path):
+            shutil.rmtree(dest_path)
+        place_file(from_path, dest_path, link_mode)
+        return True
+
+    if workers == 1:
+        placed = {asset[1] for asset in assets if sync(asset)}
+    else:
+        ordered = largest_first(assets)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(sync, ordered))
+        placed = {asset[1] for asset, result in zip(ordered, results) if result}
+    return [dest_path for _, dest_path, _ in assets if dest_path in placed]
+
+
+def make_dirs(dest_dir_path, dir_paths):
+    needed = {dest_dir_path}
+    for dir_path in dir_paths:
+        while dir_path not in needed and dir_path != os.path.dirname(dir_path):
+            needed.add(dir_path)
+            dir_path = os.path.dirname(dir_path)
+    for dir_path in sorted(needed):
+        if os.path.isfile(dir_path):
+            os.remove(dir_path)
+        os.makedirs(dir_path, exist_ok=True)
+
+
+def is_up_to_date(from_path, dest_path, checksum=False, from_stat=None):
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    if from_stat is None:
+        from_stat = os.stat(from_path)
+    if from_stat.st_size != dest_stat.st_size:
+        return False
+    if checksum:
+        return hash_file(from_path) == hash_file(dest_path)
+    return from_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+
+def place_file(from_path, dest_path, link_mode="copy"):
+    tmp_path = dest_path + ".tmp"
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    if link_mode == "hardlink":
+        try:
+            os.link(from_path, tmp_path)
+        except OSError:
+            copy_file(from_path, tmp_path)
+    elif link_mode == "reflink":
+        try:
+            reflink(from_path, tmp_path)
+        except OSError:
+            copy_file(from_path, tmp_path)
+    else:
+        copy_file(from_path, tmp_path)
+    os.replace(tmp_path, dest_path)
+
+
+def copy_file(from_path, dest_path):
+    with open(from_path, "rb") as from_file, open(dest_path, "wb") as dest_file:
+        if not clone_file(from_file, dest_file):
+            copy_range(from_file, dest_file, os.fstat(from_file.fileno()).st_size)
+    shutil.copystat(from_path, dest_path)
+
+
+def clone_file(from_file, dest_file):
+    if fcntl is None or not hasattr(fcntl, "FICLONE"):
+        return False
+    try:
+        fcntl.ioctl(dest_file.fileno(), fcntl.FICLONE, from_file.fileno())
+    except OSError:
+        return False
+    return True
+
+
+def copy_range(from_file, dest_file, size):
+    from_fd = from_file.fileno()
+    dest_fd = dest_file.fileno()
+    offset = 0
+    if hasattr(os, "copy_file_range"):
+        try:
+            while offset < size:
+                count = min(size - offset, COPY_CHUNK_SIZE)
+                copied = os.copy_file_range(from_fd, dest_fd, count, offset, offset)
+                if copied == 0:
+                    break
+                offset += copied
+        except OSError:
+            pass
+    if offset < size and hasattr(os, "sendfile"):
+        dest_file.seek(offset)
+        try:
+            while offset < size:
+                count = min(size - offset, COPY_CHUNK_SIZE)
+                copied = os.sendfile(dest_fd, from_fd, offset, count)
+                if copied == 0:
+                    break
+                offset += copied
+        except OSError:
+            pass
+    from_file.seek(offset)
+    dest_file.seek(offset)
+    shutil.copyfileobj(from_file, dest_file)
+
+
+def reflink(from_path, dest_path):
+    if fcntl is None or not hasattr(fcntl, "FICLONE"):
+        raise OSError("reflinks are not supported on this platform")
+    try:
+        with open(from_path, "rb") as from_file, open(dest_path, "wb") as dest_file:
+            fcntl.ioctl(dest_file.fileno(), fcntl.FICLONE, from_file.fileno())
+    except OSError:
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        raise
+    shutil.copystat(from_path, dest_path)
@@ -0,0 +1,133 @@
+import os
+import random
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog elf ring mountain river shire "
+    "wizard dragon forest tower king queen road home stone light shadow song"
+).split()
+
+SHAPES = {
+    "many-small": {
+        "blocks": 8,
+        "weights": {"paragraph": 4, "inline": 2, "heading": 1, "ulist": 1},
+    },
+    "few-huge": {
+        "blocks": 2000,
+        "weights": {
+            "paragraph": 4,
+            "inline": 2,
+            "heading": 1,
+            "ulist": 1,
+            "olist": 1,
+            "quote": 1,
+            "code": 1,
+        },
+    },
+    "inline-heavy": {
+        "blocks": 40,
+        "weights": {"inline": 6, "paragraph": 1, "quote": 1},
+    },
+    "list-heavy": {
+        "blocks": 40,
+        "weights": {"ulist": 3, "olist": 3, "paragraph": 1},
+    },
+    "code-heavy": {
+        "blocks": 40,
+        "weights": {"code": 4, "paragraph": 2, "heading": 1},
+    },
+}
+
+
+def sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def inline_sentence(rng, words=12):
+    parts = []
+    for _ in range(words):
+        word = rng.choice(WORDS)
+        kind = rng.randrange(8)
+        if kind == 0:
+            word = f"**{word}**"
+        elif kind == 1:
+            word = f"_{word}_"
+        elif kind == 2:
+            word = f"`{word}`"
+        elif kind == 3:
+            word = f"[{word}](https://example.com/{word})"
+        elif kind == 4:
+            word = f"![{word}](/images/{word}.png)"
+        parts.append(word)
+    return " ".join(parts)
+
+
+def generate_block(rng, kind):
+    if kind == "paragraph":
+        return "\n".join(sentence(rng) for _ in range(rng.randint(1, 4)))
+    if kind == "inline":
+        return "\n".join(inline_sentence(rng) for _ in range(rng.randint(1, 4)))
+    if kind == "heading":
+        return "#" * rng.randint(2, 6) + " " + sentence(rng, 4)
+    if kind == "ulist":
+        items = rng.randint(3, 30)
+        return "\n".join(f"- {inline_sentence(rng, 6)}" for _ in range(items))
+    if kind == "olist":
+        items = rng.randint(3, 30)
+        return "\n".join(
+            f"{i}. {inline_sentence(rng, 6)}" for i in range(1, items + 1)
+        )
+    if kind == "quote":
+        return "\n".join(f"> {sentence(rng, 8)}" for _ in range(rng.randint(1, 4)))
+    if kind == "code":
+        lines = []
+        for _ in range(rng.randint(3, 20)):
+            if rng.randrange(6) == 0:
+                lines.append("")
+            else:
+                lines.append("    " * rng.randrange(3) + sentence(rng, 5))
+        return "```\n" + "\n".join(lines) + "\n```"
+    raise ValueError(f"invalid block kind: {kind}")
+
+
+def generate_markdown(rng, shape="many-small", blocks=None):
+    if shape not in SHAPES:
+        raise ValueError(f"invalid corpus shape: {shape}")
+    spec = SHAPES[shape]
+    if blocks is None:
+        blocks = spec["blocks"]
+    kinds = list(spec["weights"])
+    weights = list(spec["weights"].values())
+    parts = ["# " + sentence(rng, 5)]
+    for kind in rng.choices(kinds, weights, k=blocks):
+        parts.append(generate_block(rng, kind))
+    return "\n\n".join(parts) + "\n"
+
+
+def generate_site(root_dir_path, shape="many-small", pages=100, seed=0):
+    rng = random.Random(seed)
+    if shape == "few-huge":
+        pages = max(1, pages // 50)
+    content_dir_path = os.path.join(root_dir_path, "content")
+    for i in range(pages):
+        page_dir_path = os.path.join(content_dir_path, f"section{i % 10}", f"page{i}")
+        os.makedirs(page_dir_path, exist_ok=True)
+        with open(os.path.join(page_dir_path, "index.md"), "w") as f:
+            f.write(generate_markdown(rng, shape))
+
+    static_dir_path = os.path.join(root_dir_path, "static")
+    os.makedirs(os.path.join(static_dir_path, "images"), exist_ok=True)
+    with open(os.path.join(static_dir_path, "index.css"), "w") as f:
+        f.write("body { margin: 0 auto; max-width: 40em; }\n")
+    for word in WORDS:
+        with open(os.path.join(static_dir_path, "images", f"{word}.png"), "wb") as f:
+            f.write(rng.randbytes(4096))
+
+    with open(os.path.join(root_dir_path, "template.html"), "w") as f:
+        f.write(
+            "<!doctype html>\n<html>\n  <head>\n"
+            "    <title>{{ Title }}</title>\n"
+            '    <link href="/index.css" rel="stylesheet" />\n'
+            "  </head>\n  <body>\n    <article>{{ Content }}</article>\n"
+            "  </body>\n</html>\n"
+        )
+    return root_dir_path
@@ -0,0 +1,50 @@
+import os
+import sys
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+BACKENDS = ["auto", "serial", "thread", "process", "free-threaded"]
+
+
+class SerialExecutor(Executor):
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def gil_enabled():
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    if is_gil_enabled is None:
+        return True
+    return is_gil_enabled()
+
+
+def make_executor(backend="auto", jobs=None):
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError(f"invalid number of jobs: {jobs}")
+    if backend == "auto":
+        if jobs == 1:
+            backend = "serial"
+        elif gil_enabled():
+            backend = "process"
+        else:
+            backend = "free-threaded"
+
+    if backend == "serial":
+        return SerialExecutor()
+    if backend == "thread":
+        return ThreadPoolExecutor(max_workers=jobs)
+    if backend == "process":
+        return ProcessPoolExecutor(max_workers=jobs)
+    if backend == "free-threaded":
+        if gil_enabled():
+            raise ValueError(
+                "free-threaded backend requires a Python build with the GIL disabled"
+            )
+        return ThreadPoolExecutor(max_workers=jobs)
+    raise ValueError(f"invalid executor backend: {backend}")
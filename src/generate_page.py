@@ -1,49 +1,228 @@
+import functools
 import os
-from markdown_to_blocks import markdown_to_html_node
 
+import tracing
+from executors import SerialExecutor
+from html_emitter import iter_html_chunks, markdown_to_html_chunks
+from output_writer import write_output
+from pipeline import Pipeline
+from plan import largest_first, plan_pages
+from template import load_template
+from tracing import call_traced, merge_events, span
 
-def generate_page(from_path, template_path, dest_path, basepath="/"):
+STREAM_THRESHOLD = 8 << 20
+
+
+def generate_page(
+    from_path,
+    template_path,
+    dest_path,
+    basepath="/",
+    cache=None,
+    assets=None,
+    images=None,
+):
     print(f" * {from_path} {template_path} -> {dest_path}")
-    from_file = open(from_path, "r")
-    markdown_content = from_file.read()
-    from_file.close()
+    with span("page", {"path": from_path}):
+        if os.path.getsize(from_path) >= STREAM_THRESHOLD:
+            template = load_template(template_path, basepath, assets)
+            page_images = images.for_page() if images is not None else None
+            return stream_page(from_path, template, dest_path, cache, page_images)
+
+        markdown_content = read_source(from_path)
+        chunks = render_chunks(
+            markdown_content, template_path, basepath, cache, assets, images
+        )
+        with span("serialize_write"):
+            return write_output(dest_path, chunks)
 
-    template_file = open(template_path, "r")
-    template = template_file.read()
-    template_file.close()
 
-    node = markdown_to_html_node(markdown_content)
-    html = node.to_html()
+def read_source(from_path):
+    with span("read"):
+        with open(from_path, "r") as from_file:
+            return from_file.read()
 
+
+def render_chunks(
+    markdown_content, template_path, basepath="/", cache=None, assets=None, images=None
+):
+    template = load_template(template_path, basepath, assets)
+    page_images = images.for_page() if images is not None else None
+    content = markdown_to_html_chunks(markdown_content, cache, page_images)
     title = extract_title(markdown_content)
-    template = template.replace("{{ Title }}", title)
-    template = template.replace("{{ Content }}", html)
-    template = template.replace('href="/', f'href="{basepath}')
-    template = template.replace('src="/', f'src="{basepath}')
+    return template.iter_render(title=title, content=content)
+
+
+def read_page(job):
+    from_path = job[0]
+    if os.path.getsize(from_path) >= STREAM_THRESHOLD:
+        return None
+    return read_source(from_path)
+
+
+def render_page(template_path, basepath, cache, assets, images, job, markdown_content):
+    from_path, dest_path, _ = job
+    if markdown_content is None:
+        return generate_page(
+            from_path, template_path, dest_path, basepath, cache, assets, images
+        )
+    print(f" * {from_path} {template_path} -> {dest_path}")
+    with span("page", {"path": from_path}):
+        chunks = render_chunks(
+            markdown_content, template_path, basepath, cache, assets, images
+        )
+        with span("serialize"):
+            return "".join(chunks)
+
+
+def write_page(job, html):
+    if isinstance(html, bool):
+        return html
+    with span("write"):
+        return write_output(job[1], [html])
+
+
+def stream_page(from_path, template, dest_path, cache=None, images=None):
+    with span("stream_render_write"):
+        title = find_title(read_lines(from_path))
+        content = iter_html_chunks(read_lines(from_path), cache, images)
+        chunks = template.iter_render(title=title, content=content)
+        return write_output(dest_path, chunks)
+
 
-    dest_dir_path = os.path.dirname(dest_path)
-    if dest_dir_path != "":
-        os.makedirs(dest_dir_path, exist_ok=True)
-    to_file = open(dest_path, "w")
-    to_file.write(template)
+def read_lines(from_path):
+    with open(from_path, "r") as from_file:
+        for line in from_file:
+            if not line.endswith("\n"):
+                yield line
+                return
+            yield line[:-1]
+    yield ""
 
 
 def generate_pages_recursive(
-    dir_path_content, template_path, dest_dir_path, basepath="/"
+    dir_path_content,
+    template_path,
+    dest_dir_path,
+    basepath="/",
+    manifest=None,
+    executor=None,
+    cache=None,
+    assets=None,
+    images=None,
 ):
-    for filename in os.listdir(dir_path_content):
-        from_path = os.path.join(dir_path_content, filename)
-        dest_path = os.path.join(dest_dir_path, filename)
-        if os.path.isfile(from_path):
-            if from_path.endswith(".md"):
-                dest_path = dest_path.replace(".md", ".html")
-                generate_page(from_path, template_path, dest_path, basepath)
-        else:
-            generate_pages_recursive(from_path, template_path, dest_path, basepath)
+    with span("page_discovery"):
+        pages = largest_first(plan_pages(dir_path_content, dest_dir_path))
+        pages = [(from_path, dest_path) for from_path, dest_path, _ in pages]
+    generate_pages(
+        pages, template_path, basepath, manifest, executor, cache, assets, images
+    )
+
+
+def generate_pages(
+    pages,
+    template_path,
+    basepath="/",
+    manifest=None,
+    executor=None,
+    cache=None,
+    assets=None,
+    images=None,
+):
+    jobs = []
+    for from_path, dest_path in pages:
+        entry = None
+        if manifest is not None:
+            entry = manifest.page_entry(
+                from_path, template_path, basepath, assets, images
+            )
+            if manifest.is_fresh(dest_path, entry):
+                continue
+        jobs.append((from_path, dest_path, entry))
+
+    if executor is None:
+        executor = SerialExecutor()
+    traced = tracing.enabled()
+    if isinstance(executor, Pipeline):
+        render = functools.partial(
+            render_page, template_path, basepath, cache, assets, images
+        )
+        if traced:
+            render = functools.partial(call_traced, render)
+
+        def write(job, rendered):
+            if traced:
+                rendered, events = rendered
+                merge_events(events)
+            return write_page(job, rendered)
+
+        results = executor.run(jobs, read_page, render, write)
+    else:
+        results = []
+        futures = []
+        for from_path, dest_path, _ in jobs:
+            args = (
+                from_path,
+                template_path,
+                dest_path,
+                basepath,
+                cache,
+                assets,
+                images,
+            )
+            if traced:
+                futures.append(executor.submit(call_traced, generate_page, *args))
+            else:
+                futures.append(executor.submit(generate_page, *args))
+        for future in futures:
+            try:
+                result = future.result()
+            except Exception as e:
+                results.append((None, e))
+                continue
+            if traced:
+                merge_events(result[1])
+            results.append((result, None))
+
+    errors = []
+    for (from_path, dest_path, entry), (_, error) in zip(jobs, results):
+        if error is not None:
+            errors.append((from_path, error))
+        elif manifest is not None:
+            manifest.record(dest_path, entry)
+    if errors:
+        errors.sort(key=lambda error: error[0])
+        raise BuildError(errors)
+
+
+def find_pages(dir_path_content, dest_dir_path):
+    return [
+        (from_path, dest_path)
+        for from_path, dest_path, _ in plan_pages(dir_path_content, dest_dir_path)
+    ]
+
+
+def page_dest_path(from_path, dir_path_content, dest_dir_path):
+    dest_path = os.path.join(
+        dest_dir_path, os.path.relpath(from_path, dir_path_content)
+    )
+    return dest_path.replace(".md", ".html")
+
+
+class BuildError(Exception):
+    def __init__(self, errors):
+        self.errors = errors
+        lines = [f"{len(errors)} page(s) failed to build:"]
+        for from_path, error in errors:
+            lines.append(f"  {from_path}: {error}")
+        super().__init__("\n".join(lines))
 
 
 def extract_title(md):
-    lines = md.split("\n")
+    return find_title(md.split("\n"))
+
+
+def find_title(lines):
     for line in lines:
         if line.startswith("# "):
             return line[2:]
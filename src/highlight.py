@@ -0,0 +1,131 @@
+import hashlib
+import html
+import re
+import threading
+from collections import OrderedDict
+
+MAX_CACHED = 1024
+
+STRING = r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+
+RULES = {
+    "python": [
+        ("comment", r"#[^\n]*"),
+        (
+            "string",
+            r"[rRbBuUfF]{0,2}(?:\"\"\"[\s\S]*?\"\"\"|'''[\s\S]*?'''|" + STRING + ")",
+        ),
+        ("meta", r"^[ \t]*@[\w.]+"),
+        (
+            "keyword",
+            r"\b(?:False|None|True|and|as|assert|async|await|break|class|continue"
+            r"|def|del|elif|else|except|finally|for|from|global|if|import|in|is"
+            r"|lambda|nonlocal|not|or|pass|raise|return|try|while|with|yield)\b",
+        ),
+        (
+            "builtin",
+            r"\b(?:self|cls|print|len|range|str|int|float|bool|list|dict|set"
+            r"|tuple|open|isinstance|super|enumerate|zip|map|sorted)\b",
+        ),
+        ("number", r"\b(?:0[xob][\da-fA-F_]+|\d[\d_]*(?:\.\d*)?(?:[eE][+-]?\d+)?j?)"),
+    ],
+    "shell": [
+        ("comment", r"(?<!\S)#[^\n]*"),
+        ("string", r'"(?:\\.|[^"\\])*"|\'[^\']*\''),
+        ("variable", r"\$(?:\{[^}\n]*\}|\w+|[@*#?$!-])"),
+        (
+            "keyword",
+            r"\b(?:if|then|else|elif|fi|for|while|until|do|done|case|esac|in"
+            r"|function|return|export|local)\b",
+        ),
+        (
+            "builtin",
+            r"\b(?:echo|cd|printf|read|source|set|unset|exit|test|eval|exec)\b",
+        ),
+    ],
+    "json": [
+        ("property", r'"(?:\\.|[^"\\])*"(?=\s*:)'),
+        ("string", r'"(?:\\.|[^"\\])*"'),
+        ("number", r"-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?"),
+        ("literal", r"\b(?:true|false|null)\b"),
+    ],
+    "html": [
+        ("comment", r"<!--[\s\S]*?-->"),
+        ("meta", r"<![A-Za-z][^>]*>"),
+        ("tag", r"</?[A-Za-z][\w:-]*|/?>"),
+        ("attr", r"\b[\w:-]+(?==)"),
+        ("string", r'"[^"]*"|\'[^\']*\''),
+        ("literal", r"&#?\w+;"),
+    ],
+    "css": [
+        ("comment", r"/\*[\s\S]*?\*/"),
+        ("string", STRING),
+        ("keyword", r"@[\w-]+|!important\b"),
+        ("property", r"(?<![\w-])[\w-]+(?=\s*:[^;{}]*[;}])"),
+        ("number", r"#[0-9a-fA-F]{3,8}\b|(?<![\w-])-?\d*\.?\d+(?:[a-zA-Z]+|%)?"),
+    ],
+}
+
+ALIASES = {
+    "py": "python",
+    "python3": "python",
+    "sh": "shell",
+    "bash": "shell",
+    "zsh": "shell",
+    "console": "shell",
+    "xml": "html",
+    "svg": "html",
+}
+
+patterns = {
+    language: re.compile(
+        "|".join(f"(?P<{name}>{rule})" for name, rule in rules), re.MULTILINE
+    )
+    for language, rules in RULES.items()
+}
+
+highlighted = OrderedDict()
+highlighted_lock = threading.Lock()
+
+
+def fence_language(fence):
+    info = fence.lstrip("`").strip()
+    if info == "":
+        return None
+    name = info.split()[0].lower()
+    name = ALIASES.get(name, name)
+    if name not in patterns:
+        return None
+    return name
+
+
+def highlight(code, language):
+    digest = hashlib.blake2b(code.encode(), digest_size=16).digest()
+    key = (language, digest)
+    with highlighted_lock:
+        result = highlighted.get(key)
+        if result is not None:
+            highlighted.move_to_end(key)
+            return result
+    result = tokenize(code, language)
+    with highlighted_lock:
+        highlighted[key] = result
+        while len(highlighted) > MAX_CACHED:
+            highlighted.popitem(last=False)
+    return result
+
+
+def tokenize(code, language):
+    parts = []
+    position = 0
+    for match in patterns[language].finditer(code):
+        if match.start() == match.end():
+            continue
+        if match.start() > position:
+            parts.append(html.escape(code[position : match.start()], quote=False))
+        token = html.escape(match.group(), quote=False)
+        parts.append(f'<span class="hl-{match.lastgroup}">{token}</span>')
+        position = match.end()
+    if position < len(code):
+        parts.append(html.escape(code[position:], quote=False))
+    return "".join(parts)
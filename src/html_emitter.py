@@ -0,0 +1,186 @@
+import inline_markdown
+import tracing
+from highlight import fence_language, highlight
+from inline_markdown import (
+    DELIMITERS,
+    INLINE_SCANNERS,
+    image_pattern,
+    link_pattern,
+    text_to_textnodes,
+)
+from markdown_to_blocks import BlockType, block_to_html_node, is_cacheable, scan_blocks
+from textnode import text_node_to_html_node
+from tracing import span
+
+INLINE_TAGS = {"**": "b", "_": "i", "`": "code"}
+
+fast_inline = True
+
+
+def markdown_to_html(markdown, cache=None, images=None):
+    return "".join(markdown_to_html_chunks(markdown, cache, images))
+
+
+def markdown_to_html_chunks(markdown, cache=None, images=None):
+    with span("markdown_parse"):
+        return list(iter_html_chunks(markdown.split("\n"), cache, images))
+
+
+def iter_html_chunks(lines, cache=None, images=None):
+    yield "<div>"
+    traced = tracing.enabled()
+    for block in scan_blocks(lines):
+        if traced:
+            with span("block_conversion"):
+                html = convert_block(block, cache, images)
+        else:
+            html = convert_block(block, cache, images)
+        yield html
+    yield "</div>"
+
+
+def convert_block(block, cache=None, images=None):
+    if cache is None or not is_cacheable(block, images):
+        return block_to_html(block, images)
+    key = cache.key(block)
+    html = cache.get(key)
+    if html is None:
+        html = block_to_html(block)
+        cache.put(key, html)
+    return html
+
+
+def block_to_html(block, images=None):
+    emitter = BLOCK_EMITTERS.get(block.block_type)
+    if emitter is None:
+        return block_to_html_node(block, images).to_html()
+    return emitter(block.lines, images)
+
+
+def paragraph_to_html(lines, images=None):
+    return f"<p>{inline_to_html(' '.join(lines), images)}</p>"
+
+
+def heading_to_html(lines, images=None):
+    block = lines[0] if len(lines) == 1 else "\n".join(lines)
+    level = len(block) - len(block.lstrip("#"))
+    if level + 1 >= len(block):
+        raise ValueError(f"invalid heading level: {level}")
+    return f"<h{level}>{inline_to_html(block[level + 1 :], images)}</h{level}>"
+
+
+def code_to_html(lines, images=None):
+    if len(lines) < 2 or not lines[0].startswith("```"):
+        raise ValueError("invalid code block")
+    if not lines[-1].startswith("```"):
+        raise ValueError("invalid code block")
+    text = "".join(line + "\n" for line in lines[1:-1])
+    language = fence_language(lines[0])
+    if language is not None:
+        code = highlight(text, language)
+        return f'<pre><code class="language-{language}">{code}</code></pre>'
+    return f"<pre><code>{text}</code></pre>"
+
+
+def olist_to_html(lines, images=None):
+    items = (
+        f"<li>{inline_to_html(item.split('. ', 1)[1], images)}</li>" for item in lines
+    )
+    return f"<ol>{''.join(items)}</ol>"
+
+
+def ulist_to_html(lines, images=None):
+    items = (f"<li>{inline_to_html(item[2:], images)}</li>" for item in lines)
+    return f"<ul>{''.join(items)}</ul>"
+
+
+def quote_to_html(lines, images=None):
+    new_lines = []
+    for line in lines:
+        if not line.startswith(">"):
+            raise ValueError("invalid quote block")
+        new_lines.append(line.lstrip(">").strip())
+    return f"<blockquote>{inline_to_html(' '.join(new_lines), images)}</blockquote>"
+
+
+def inline_to_html(text, images=None):
+    if not tracing.enabled():
+        return emit_inline(text, images)
+    with span("inline_parse"):
+        return emit_inline(text, images)
+
+
+def emit_inline(text, images=None):
+    if not fast_inline:
+        return "".join(
+            text_node_to_html_node(text_node, images).to_html()
+            for text_node in text_to_textnodes(text)
+        )
+    markup_pattern = inline_markdown.markup_pattern
+    match = markup_pattern.search(text)
+    if match is None:
+        return text
+
+    parts = []
+    text_start = 0
+    while match is not None:
+        start = match.start()
+        html, end = emit_token(text, match.group(), start, images)
+        if end is None:
+            match = markup_pattern.search(text, start + 1)
+            continue
+        if start > text_start:
+            parts.append(text[text_start:start])
+        if html is not None:
+            parts.append(html)
+        text_start = end
+        match = markup_pattern.search(text, end)
+    if text_start < len(text):
+        parts.append(text[text_start:])
+    return "".join(parts)
+
+
+def emit_token(text, token, start, images=None):
+    if token == "![":
+        image = image_pattern.match(text, start)
+        if image is None:
+            return None, None
+        alt, src = image.groups()
+        if images is None:
+            return f'<img src="{src}" alt="{alt}"></img>', image.end()
+        props = "".join(
+            f' {prop}="{value}"' for prop, value in images.props(src, alt).items()
+        )
+        return f"<img{props}></img>", image.end()
+    if token == "[":
+        if start > 0 and text[start - 1] == "!":
+            return None, None
+        link = link_pattern.match(text, start)
+        if link is None:
+            return None, None
+        return f'<a href="{link.group(2)}">{link.group(1)}</a>', link.end()
+    if token not in DELIMITERS:
+        node, end = INLINE_SCANNERS[token](text, start)
+        if node is None:
+            return None, end
+        return text_node_to_html_node(node, images).to_html(), end
+
+    content_start = start + len(token)
+    close = text.find(token, content_start)
+    if close == -1:
+        raise ValueError("invalid markdown, formatted section not closed")
+    end = close + len(token)
+    if close == content_start:
+        return None, end
+    tag = INLINE_TAGS[token]
+    return f"<{tag}>{text[content_start:close]}</{tag}>", end
+
+
+BLOCK_EMITTERS = {
+    BlockType.PARAGRAPH: paragraph_to_html,
+    BlockType.HEADING: heading_to_html,
+    BlockType.CODE: code_to_html,
+    BlockType.OLIST: olist_to_html,
+    BlockType.ULIST: ulist_to_html,
+    BlockType.QUOTE: quote_to_html,
+}
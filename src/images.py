@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import struct
+
+from plan import plan_assets
+
+IMAGE_INDEX_VERSION = "2"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xD9)) | {0x01}
+
+
+class ImageIndex:
+    def __init__(self, path=None, sizes=None, eager=1):
+        self.path = path
+        self.sizes = sizes if sizes is not None else {}
+        self.eager = eager
+        self.urls = {}
+        self.digest = None
+
+    @classmethod
+    def load(cls, path, eager=1):
+        if path is None or not os.path.exists(path):
+            return cls(path, eager=eager)
+        with open(path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != IMAGE_INDEX_VERSION:
+            return cls(path, eager=eager)
+        return cls(path, data.get("images", {}), eager)
+
+    def save(self):
+        if self.path is None:
+            return
+        dir_path = os.path.dirname(self.path)
+        if dir_path != "":
+            os.makedirs(dir_path, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"version": IMAGE_INDEX_VERSION, "images": self.sizes},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+        os.replace(tmp_path, self.path)
+
+    def scan(self, static_dir_path, url_prefix="/", assets=None):
+        if assets is None:
+            assets = plan_assets(static_dir_path, static_dir_path)
+        sizes = {}
+        for path, _, stat in assets:
+            if not path.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            relative_path = os.path.relpath(path, static_dir_path)
+            relative_path = relative_path.replace(os.sep, "/")
+            key = [stat.st_size, stat.st_mtime_ns]
+            cached = self.sizes.get(relative_path)
+            if cached is not None and cached[:2] == key:
+                sizes[relative_path] = cached
+                continue
+            size = read_image_size(path)
+            if size is not None:
+                sizes[relative_path] = key + list(size)
+        self.sizes = sizes
+        return self.index(url_prefix)
+
+    def index(self, url_prefix="/"):
+        self.urls = {
+            url_prefix + relative_path: (width, height)
+            for relative_path, (_, _, width, height) in self.sizes.items()
+        }
+        encoded = json.dumps([self.eager, sorted(self.urls.items())]).encode()
+        self.digest = hashlib.sha256(encoded).hexdigest()
+        return self
+
+    def size(self, url):
+        return self.urls.get(url)
+
+    def for_page(self):
+        return PageImages(self, self.eager)
+
+
+class PageImages:
+    __slots__ = ("index", "eager", "count")
+
+    def __init__(self, index, eager=1):
+        self.index = index
+        self.eager = eager
+        self.count = 0
+
+    def props(self, src, alt):
+        props = {"src": src, "alt": alt}
+        size = self.index.size(src)
+        if size is not None:
+            props["width"] = str(size[0])
+            props["height"] = str(size[1])
+        self.count += 1
+        if self.count > self.eager:
+            props["loading"] = "lazy"
+        props["decoding"] = "async"
+        return props
+
+
+def read_image_size(path):
+    with open(path, "rb") as f:
+        head = f.read(32)
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        if head.startswith((b"GIF87a", b"GIF89a")):
+            return struct.unpack("<HH", head[6:10])
+        if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+            return webp_size(head)
+        if head.startswith(b"\xff\xd8"):
+            f.seek(2)
+            return jpeg_size(f)
+    return None
+
+
+def webp_size(head):
+    chunk = head[12:16]
+    if chunk == b"VP8 " and head[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and head[20:21] == b"\x2f":
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def jpeg_size(f):
+    while True:
+        byte = f.read(1)
+        if byte == b"":
+            return None
+        if byte != b"\xff":
+            continue
+        marker = f.read(1)
+        while marker == b"\xff":
+            marker = f.read(1)
+        if marker == b"" or marker == b"\x00":
+            continue
+        marker = marker[0]
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+        if marker == 0xD9:
+            return None
+        header = f.read(2)
+        if len(header) < 2:
+            return None
+        length = struct.unpack(">H", header)[0]
+        if marker in JPEG_SOF_MARKERS:
+            segment = f.read(5)
+            if len(segment) < 5:
+                return None
+            height, width = struct.unpack(">HH", segment[1:5])
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
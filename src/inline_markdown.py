@@ -2,99 +2,70 @@ import re
 
 from textnode import TextNode, TextType
 
+DELIMITERS = {"**": TextType.BOLD, "_": TextType.ITALIC, "`": TextType.CODE}
+BUILTIN_TOKENS = ["![", "[", "**", "_", "`"]
 
-def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    return nodes
+INLINE_SCANNERS = {}
 
 
-def split_nodes_delimiter(old_nodes, delimiter, text_type):
-    new_nodes = []
-    for old_node in old_nodes:
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
-        split_nodes = []
-        sections = old_node.text.split(delimiter)
-        if len(sections) % 2 == 0:
-            raise ValueError("invalid markdown, formatted section not closed")
-        for i in range(len(sections)):
-            if sections[i] == "":
-                continue
-            if i % 2 == 0:
-                split_nodes.append(TextNode(sections[i], TextType.TEXT))
-            else:
-                split_nodes.append(TextNode(sections[i], text_type))
-        new_nodes.extend(split_nodes)
-    return new_nodes
+def compile_markup_pattern():
+    tokens = BUILTIN_TOKENS + list(INLINE_SCANNERS)
+    return re.compile("|".join(re.escape(token) for token in tokens))
 
 
-def split_nodes_image(old_nodes):
-    new_nodes = []
-    for old_node in old_nodes:
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
-        original_text = old_node.text
-        images = extract_markdown_images(original_text)
-        if len(images) == 0:
-            new_nodes.append(old_node)
-            continue
-        for image in images:
-            sections = original_text.split(f"![{image[0]}]({image[1]})", 1)
-            if len(sections) != 2:
-                raise ValueError("invalid markdown, image section not closed")
-            if sections[0] != "":
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
-            new_nodes.append(
-                TextNode(
-                    image[0],
-                    TextType.IMAGE,
-                    image[1],
-                )
-            )
-            original_text = sections[1]
-        if original_text != "":
-            new_nodes.append(TextNode(original_text, TextType.TEXT))
-    return new_nodes
+markup_pattern = compile_markup_pattern()
+image_pattern = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+link_pattern = re.compile(r"\[([^\[\]]*)\]\(([^\(\)]*)\)")
 
 
-def split_nodes_link(old_nodes):
-    new_nodes = []
-    for old_node in old_nodes:
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
-        original_text = old_node.text
-        links = extract_markdown_links(original_text)
-        if len(links) == 0:
-            new_nodes.append(old_node)
-            continue
-        for link in links:
-            sections = original_text.split(f"[{link[0]}]({link[1]})", 1)
-            if len(sections) != 2:
-                raise ValueError("invalid markdown, link section not closed")
-            if sections[0] != "":
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
-            new_nodes.append(TextNode(link[0], TextType.LINK, link[1]))
-            original_text = sections[1]
-        if original_text != "":
-            new_nodes.append(TextNode(original_text, TextType.TEXT))
-    return new_nodes
+def text_to_textnodes(text):
+    match = markup_pattern.search(text)
+    if match is None:
+        if text == "":
+            return []
+        return [TextNode(text, TextType.TEXT)]
 
+    nodes = []
+    text_start = 0
+    while match is not None:
+        token = match.group()
+        start = match.start()
+        node, end = scan_token(text, token, start)
+        if end is None:
+            match = markup_pattern.search(text, start + 1)
+            continue
+        if start > text_start:
+            nodes.append(TextNode(text[text_start:start], TextType.TEXT))
+        if node is not None:
+            nodes.append(node)
+        text_start = end
+        match = markup_pattern.search(text, end)
+    if text_start < len(text):
+        nodes.append(TextNode(text[text_start:], TextType.TEXT))
+    return nodes
 
-def extract_markdown_images(text):
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
 
+def scan_token(text, token, start):
+    if token == "![":
+        image = image_pattern.match(text, start)
+        if image is None:
+            return None, None
+        return TextNode(image.group(1), TextType.IMAGE, image.group(2)), image.end()
+    if token == "[":
+        if start > 0 and text[start - 1] == "!":
+            return None, None
+        link = link_pattern.match(text, start)
+        if link is None:
+            return None, None
+        return TextNode(link.group(1), TextType.LINK, link.group(2)), link.end()
+    if token not in DELIMITERS:
+        return INLINE_SCANNERS[token](text, start)
 
-def extract_markdown_links(text):
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    content_start = start + len(token)
+    close = text.find(token, content_start)
+    if close == -1:
+        raise ValueError("invalid markdown, formatted section not closed")
+    end = close + len(token)
+    if close == content_start:
+        return None, end
+    return TextNode(text[content_start:close], DELIMITERS[token]), end
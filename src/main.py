@@ -1,30 +1,433 @@
+import argparse
 import os
-import shutil
 import sys
+import time
 
-from copystatic import copy_files_recursive
-from generate_page import generate_pages_recursive
+from assets import fingerprint_files, write_asset_manifest
+from block_cache import open_block_cache
+from compress import MIN_SIZE, write_gzip_sidecars
+from copystatic import LINK_MODES, sync_files
+from executors import BACKENDS, make_executor
+from generate_page import (
+    BuildError,
+    find_pages,
+    generate_pages,
+    page_dest_path,
+)
+from images import ImageIndex
+from manifest import BuildManifest
+from pipeline import Pipeline
+from plan import format_size, plan_assets, plan_build
+from shard import (
+    MergeError,
+    merge_shards,
+    parse_shard,
+    shard_plan,
+    shard_suffix,
+    write_shard_manifest,
+)
+import tracing
+from tracing import span
+from watch import watch
 
 dir_path_static = "./static"
 dir_path_docs = "./docs"
 dir_path_content = "./content"
 template_path = "./template.html"
+manifest_path = "./.ssg-cache/manifest.json"
+block_cache_path = "./.ssg-cache/blocks"
+image_index_path = "./.ssg-cache/images.json"
 
 
-def main():
-    basepath = "/"
-    if len(sys.argv) > 1:
-        basepath = sys.argv[1]
+def make_parser():
+    parser = argparse.ArgumentParser(description="Build the static site into docs/")
+    parser.add_argument("basepath", nargs="?", default="/")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="keep docs/ and only regenerate pages whose inputs changed",
+    )
+    parser.add_argument(
+        "--checksum",
+        action="store_true",
+        help="compare static files by content hash instead of size and mtime",
+    )
+    parser.add_argument(
+        "--link",
+        choices=LINK_MODES,
+        default="copy",
+        help="how static files are placed in docs/",
+    )
+    parser.add_argument(
+        "--copy-jobs",
+        type=int,
+        default=1,
+        help="number of static files to copy in parallel (0 means one per CPU)",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="print every static file as it is copied",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of pages to render in parallel (0 means one per CPU)",
+    )
+    parser.add_argument(
+        "--executor",
+        choices=BACKENDS,
+        default="auto",
+        help="backend used to render pages in parallel",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="overlap source reads, rendering and output writes with asyncio",
+    )
+    parser.add_argument(
+        "--readers",
+        type=int,
+        default=4,
+        help="number of concurrent source reads in --pipeline mode",
+    )
+    parser.add_argument(
+        "--writers",
+        type=int,
+        default=4,
+        help="number of concurrent output writes in --pipeline mode",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=16,
+        help="pages buffered between pipeline stages before reads wait",
+    )
+    parser.add_argument(
+        "--block-cache",
+        action="store_true",
+        help="reuse rendered HTML of unchanged blocks across builds",
+    )
+    parser.add_argument(
+        "--block-cache-size",
+        type=int,
+        default=64,
+        metavar="MB",
+        help="maximum size of the on-disk block cache",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="write precompressed .gz sidecars next to HTML, CSS, SVG and JS",
+    )
+    parser.add_argument(
+        "--gzip-min-size",
+        type=int,
+        default=MIN_SIZE,
+        metavar="BYTES",
+        help="do not compress outputs smaller than this",
+    )
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="add content hashes to static file names and rewrite references",
+    )
+    parser.add_argument(
+        "--image-dimensions",
+        action="store_true",
+        help="add width, height and lazy-loading attributes to images",
+    )
+    parser.add_argument(
+        "--eager-images",
+        type=int,
+        default=1,
+        metavar="N",
+        help="number of images at the top of each page that are not lazy-loaded",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="rebuild changed pages and assets whenever sources change",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=0.5,
+        help="seconds between checks for changes in --watch mode",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        metavar="I/N",
+        help="build only shard I of N into its own output directory",
+    )
+    parser.add_argument(
+        "--shard-balance",
+        action="store_true",
+        help="assign shard jobs by file size instead of by path hash",
+    )
+    parser.add_argument(
+        "--merge",
+        nargs="+",
+        metavar="DIR",
+        help="combine the output directories of all shards into docs/",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="print the planned page and asset jobs without building",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="write a Chrome trace of the build stages to PATH",
+    )
+    return parser
 
-    print("Deleting docs directory...")
-    if os.path.exists(dir_path_docs):
-        shutil.rmtree(dir_path_docs)
 
+def main(argv=None):
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    if args.copy_jobs < 0:
+        parser.error(f"invalid number of copy jobs: {args.copy_jobs}")
+    if args.shard is not None and (args.watch or args.fingerprint):
+        parser.error("--shard cannot be combined with --watch or --fingerprint")
+    if args.merge:
+        merge(args)
+        return
+    if args.plan:
+        _, plan = make_plan(args)
+        print(plan.format())
+        return
+    if args.trace:
+        tracing.start_tracing()
+
+    _, build_manifest_path = output_paths(args)
+    if args.incremental or args.watch:
+        manifest = BuildManifest.load(build_manifest_path)
+    else:
+        manifest = BuildManifest(build_manifest_path)
+        manifest.sidecars = BuildManifest.load(build_manifest_path).sidecars
+
+    cache = None
+    if args.block_cache:
+        cache = open_block_cache(
+            block_cache_path, disk_bytes=args.block_cache_size << 20
+        )
+
+    jobs = args.jobs if args.jobs > 0 else None
+    with make_executor(args.executor, jobs) as executor:
+        if args.pipeline:
+            executor = Pipeline(
+                executor,
+                jobs or os.cpu_count() or 1,
+                args.readers,
+                args.writers,
+                args.queue_size,
+            )
+        ok = build(args, manifest, executor, cache)
+        if args.trace:
+            tracing.stop_tracing().export_chrome_trace(args.trace)
+        if args.watch:
+            print("Watching for changes...")
+            try:
+                watch(
+                    [dir_path_content, dir_path_static, template_path],
+                    lambda changed: rebuild(args, manifest, executor, cache, changed),
+                    args.poll_interval,
+                )
+            except KeyboardInterrupt:
+                pass
+    # Worker processes only count towards RUSAGE_CHILDREN once the pool has
+    # shut down and waited for them.
+    rss = tracing.peak_rss()
+    if rss is not None:
+        print(f"Peak memory: {rss / (1 << 20):.1f} MB")
+    if not (ok or args.watch):
+        sys.exit(1)
+
+
+def build(args, manifest, executor, cache=None):
+    dest_dir_path, _ = output_paths(args)
+    with span("plan"):
+        full_plan, plan = make_plan(args)
     print("Copying static files to docs directory...")
-    copy_files_recursive(dir_path_static, dir_path_docs)
+    assets = copy_static(args, manifest, plan.assets)
+    # Pages in any shard may reference images copied by another one.
+    images = scan_images(args, True, full_plan.assets)
 
     print("Generating pages...")
-    generate_pages_recursive(dir_path_content, template_path, dir_path_docs, basepath)
+    try:
+        generate_pages(
+            plan.page_jobs(),
+            template_path,
+            args.basepath,
+            manifest,
+            executor,
+            cache,
+            assets,
+            images,
+        )
+    except BuildError as e:
+        manifest.save()
+        print(e, file=sys.stderr)
+        return False
+    if args.shard is not None:
+        write_shard_manifest(full_plan, plan, dest_dir_path, *args.shard, manifest)
+    if args.gzip:
+        compress_outputs(args, manifest, manifest.outputs())
+    removed = manifest.prune(dest_dir_path)
+    if not (args.incremental or args.watch):
+        removed.extend(manifest.prune_untracked(dest_dir_path))
+    for dest_path in removed:
+        print(f" - {dest_path}")
+    manifest.save()
+    return True
+
+
+def rebuild(args, manifest, executor, cache, changed):
+    pages = set()
+    static_changed = False
+    for path in sorted(changed):
+        if path == template_path:
+            pages.update(find_pages(dir_path_content, dir_path_docs))
+        elif path.startswith(dir_path_static + os.sep):
+            static_changed = True
+            if not os.path.exists(path):
+                relative_path = os.path.relpath(path, dir_path_static)
+                manifest.forget(os.path.join(dir_path_docs, relative_path))
+        elif path.startswith(dir_path_content + os.sep) and path.endswith(".md"):
+            dest_path = page_dest_path(path, dir_path_content, dir_path_docs)
+            if os.path.exists(path):
+                pages.add((path, dest_path))
+            else:
+                manifest.forget(dest_path)
+
+    if static_changed and args.fingerprint:
+        for dest_path in list(manifest.assets):
+            manifest.forget(dest_path)
+    if static_changed and (args.fingerprint or args.image_dimensions):
+        pages.update(find_pages(dir_path_content, dir_path_docs))
+    assets = None
+    planned = None
+    if static_changed or args.fingerprint:
+        planned = plan_assets(dir_path_static, dir_path_docs)
+        assets = copy_static(args, manifest, planned)
+    images = scan_images(args, static_changed, planned)
+    try:
+        generate_pages(
+            sorted(pages),
+            template_path,
+            args.basepath,
+            manifest,
+            executor,
+            cache,
+            assets,
+            images,
+        )
+    except BuildError as e:
+        print(e, file=sys.stderr)
+    if args.gzip:
+        outputs = [dest_path for _, dest_path in pages if os.path.exists(dest_path)]
+        if static_changed:
+            outputs.extend(manifest.assets)
+        compress_outputs(args, manifest, outputs)
+    for dest_path in manifest.prune(dir_path_docs):
+        print(f" - {dest_path}")
+    manifest.save()
+
+
+def copy_static(args, manifest, planned=None):
+    with span("static_copy"):
+        dest_dir_path, _ = output_paths(args)
+        if planned is None:
+            planned = plan_assets(dir_path_static, dest_dir_path)
+        if not args.fingerprint:
+            started = time.perf_counter()
+            copied = sync_files(
+                planned,
+                dest_dir_path,
+                manifest,
+                args.checksum,
+                args.link,
+                copy_workers(args),
+                args.verbose,
+            )
+            report_copy(planned, copied, time.perf_counter() - started)
+            return None
+        assets = fingerprint_files(planned, dest_dir_path, manifest, args.link)
+        write_asset_manifest(assets, dest_dir_path, manifest)
+        return assets
+
+
+def output_paths(args):
+    if args.shard is None:
+        return dir_path_docs, manifest_path
+    suffix = shard_suffix(*args.shard)
+    shard_manifest_path = manifest_path.replace(".json", f".{suffix}.json")
+    return f"{dir_path_docs}-{suffix}", shard_manifest_path
+
+
+def make_plan(args):
+    dest_dir_path, _ = output_paths(args)
+    full_plan = plan_build(dir_path_content, dir_path_static, dest_dir_path)
+    if args.shard is None:
+        return full_plan, full_plan
+    return full_plan, shard_plan(full_plan, *args.shard, args.shard_balance)
+
+
+def merge(args):
+    print(f"Merging {len(args.merge)} shard(s) into {dir_path_docs}...")
+    started = time.perf_counter()
+    try:
+        copied, removed = merge_shards(
+            args.merge, dir_path_docs, args.link, copy_workers(args), args.verbose
+        )
+    except MergeError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    for dest_path in removed:
+        print(f" - {dest_path}")
+    print(f"Merged {len(copied)} file(s) in {time.perf_counter() - started:.2f}s")
+
+
+def copy_workers(args):
+    return args.copy_jobs if args.copy_jobs > 0 else os.cpu_count() or 1
+
+
+def report_copy(planned, copied, elapsed):
+    if not copied:
+        return
+    sizes = {dest_path: stat.st_size for _, dest_path, stat in planned}
+    total = sum(sizes[dest_path] for dest_path in copied)
+    rate = format_size(int(total / max(elapsed, 1e-9)))
+    print(
+        f"Copied {len(copied)} file(s), {format_size(total)} in {elapsed:.2f}s "
+        f"({rate}/s)"
+    )
+
+
+def scan_images(args, rescan=True, planned=None):
+    if not args.image_dimensions:
+        return None
+    with span("image_scan"):
+        images = ImageIndex.load(image_index_path, args.eager_images)
+        if not rescan:
+            return images.index()
+        images.scan(dir_path_static, assets=planned)
+        images.save()
+    return images
+
+
+def compress_outputs(args, manifest, outputs):
+    with span("gzip"):
+        written = write_gzip_sidecars(outputs, manifest, args.gzip_min_size)
+    for sidecar_path in written:
+        print(f" * {sidecar_path}")
 
 
-main()
+if __name__ == "__main__":
+    main()
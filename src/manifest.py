@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+
+from block_cache import RENDERER_VERSION
+
+GENERATOR_VERSION = "1"
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    def __init__(self, path, entries=None, assets=None, sidecars=None):
+        self.path = path
+        self.entries = entries if entries is not None else {}
+        self.assets = assets if assets is not None else {}
+        self.sidecars = sidecars if sidecars is not None else {}
+        self.seen = set()
+        self.template_hashes = {}
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            return cls(path)
+        with open(path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != GENERATOR_VERSION:
+            return cls(path)
+        return cls(
+            path,
+            data.get("pages", {}),
+            data.get("assets", {}),
+            data.get("sidecars", {}),
+        )
+
+    def save(self):
+        dir_path = os.path.dirname(self.path)
+        if dir_path != "":
+            os.makedirs(dir_path, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "version": GENERATOR_VERSION,
+                    "pages": self.entries,
+                    "assets": self.assets,
+                    "sidecars": self.sidecars,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+        os.replace(tmp_path, self.path)
+
+    def template_hash(self, template_path):
+        stat = os.stat(template_path)
+        key = (template_path, stat.st_mtime_ns, stat.st_size)
+        if key not in self.template_hashes:
+            self.template_hashes[key] = hash_file(template_path)
+        return self.template_hashes[key]
+
+    def page_entry(self, from_path, template_path, basepath, assets=None, images=None):
+        entry = {
+            "source": from_path,
+            "source_hash": hash_file(from_path),
+            "template_hash": self.template_hash(template_path),
+            "basepath": basepath,
+            "renderer_version": RENDERER_VERSION,
+        }
+        if assets is not None:
+            entry["assets_hash"] = assets.digest
+        if images is not None:
+            entry["images_hash"] = images.digest
+        return entry
+
+    def is_fresh(self, dest_path, entry):
+        self.seen.add(dest_path)
+        return self.entries.get(dest_path) == entry and os.path.exists(dest_path)
+
+    def record(self, dest_path, entry):
+        self.seen.add(dest_path)
+        self.entries[dest_path] = entry
+
+    def record_asset(self, dest_path, from_path):
+        self.seen.add(dest_path)
+        self.assets[dest_path] = from_path
+
+    def record_sidecar(self, sidecar_path, source_hash):
+        self.seen.add(sidecar_path)
+        self.sidecars[sidecar_path] = source_hash
+
+    def outputs(self):
+        return sorted(
+            path for path in self.seen if path in self.entries or path in self.assets
+        )
+
+    def forget(self, dest_path):
+        self.seen.discard(dest_path)
+        self.seen.discard(dest_path + ".gz")
+
+    def prune(self, root_dir_path):
+        removed = []
+        for outputs in [self.entries, self.assets, self.sidecars]:
+            for dest_path in sorted(outputs):
+                if dest_path in self.seen:
+                    continue
+                del outputs[dest_path]
+                if os.path.isfile(dest_path):
+                    os.remove(dest_path)
+                    remove_empty_dirs(os.path.dirname(dest_path), root_dir_path)
+                removed.append(dest_path)
+        return removed
+
+    def prune_untracked(self, root_dir_path):
+        seen = {os.path.normpath(path) for path in self.seen}
+        removed = []
+        for dir_path, _, filenames in os.walk(root_dir_path, topdown=False):
+            for filename in sorted(filenames):
+                path = os.path.join(dir_path, filename)
+                if os.path.normpath(path) not in seen:
+                    os.remove(path)
+                    removed.append(path)
+            if dir_path != root_dir_path and not os.listdir(dir_path):
+                os.rmdir(dir_path)
+        return removed
+
+
+def remove_empty_dirs(dir_path, root_dir_path):
+    root_dir_path = os.path.abspath(root_dir_path)
+    dir_path = os.path.abspath(dir_path)
+    while dir_path != root_dir_path and dir_path.startswith(root_dir_path + os.sep):
+        if os.listdir(dir_path):
+            return
+        os.rmdir(dir_path)
+        dir_path = os.path.dirname(dir_path)
@@ -1,8 +1,12 @@
+import re
 from enum import Enum
 
-from htmlnode import ParentNode
+from arena import ArenaTree
+from highlight import fence_language, highlight
+from htmlnode import LeafNode, ParentNode
 from inline_markdown import text_to_textnodes
 from textnode import text_node_to_html_node, TextNode, TextType
+from tracing import span
 
 
 class BlockType(Enum):
@@ -14,15 +18,120 @@ class BlockType(Enum):
     ULIST = "unordered_list"
 
 
+heading_pattern = re.compile(r"#{1,6} ")
+
+BLOCK_DETECTORS = {}
+CACHEABLE_BLOCK_TYPES = set(BlockType)
+
+
+class Block:
+    __slots__ = ("block_type", "lines", "start", "end")
+
+    def __init__(self, block_type, lines, start=0, end=None):
+        self.block_type = block_type
+        self.lines = lines
+        self.start = start
+        self.end = end if end is not None else start + len(lines)
+
+    @property
+    def text(self):
+        return "\n".join(self.lines)
+
+    def __eq__(self, other):
+        return (
+            self.block_type == other.block_type
+            and self.lines == other.lines
+            and self.start == other.start
+            and self.end == other.end
+        )
+
+    def __repr__(self):
+        return f"Block({self.block_type.value}, {self.lines}, {self.start}, {self.end})"
+
+
 def markdown_to_blocks(markdown):
-    blocks = markdown.split("\n\n")
-    filtered_blocks = []
-    for block in blocks:
-        if block == "":
+    return [block.text for block in scan_blocks(markdown.split("\n"))]
+
+
+def scan_blocks(lines, first_line=0, fences=True):
+    block_lines = None
+    block_type = None
+    fence_lines = None
+    start = first_line
+    for number, line in enumerate(lines, first_line):
+        if fence_lines is not None:
+            fence_lines.append(line)
+            if line.startswith("```"):
+                block = Block(BlockType.CODE, fence_lines, start, number + 1)
+                yield detect_block(block)
+                fence_lines = None
             continue
-        block = block.strip()
-        filtered_blocks.append(block)
-    return filtered_blocks
+
+        if line == "":
+            if block_lines is not None:
+                yield finish_block(block_lines, start, block_type)
+                block_lines = None
+            continue
+
+        if block_lines is None:
+            line = line.lstrip()
+            if line == "":
+                continue
+            start = number
+            if fences and line.startswith("```"):
+                fence_lines = [line]
+                continue
+            block_lines = [line]
+            if heading_pattern.match(line):
+                block_type = BlockType.HEADING
+            elif line.startswith(">"):
+                block_type = BlockType.QUOTE
+            elif line.startswith("- "):
+                block_type = BlockType.ULIST
+            elif line.startswith("1. "):
+                block_type = BlockType.OLIST
+            else:
+                block_type = BlockType.PARAGRAPH
+            continue
+
+        block_lines.append(line)
+        if block_type == BlockType.QUOTE:
+            if not line.startswith(">"):
+                block_type = BlockType.PARAGRAPH
+        elif block_type == BlockType.ULIST:
+            if not line.startswith("- "):
+                block_type = BlockType.PARAGRAPH
+        elif block_type == BlockType.OLIST:
+            if not line.startswith(f"{len(block_lines)}. "):
+                block_type = BlockType.PARAGRAPH
+
+    if fence_lines is not None:
+        yield from scan_blocks(fence_lines, start, fences=False)
+    elif block_lines is not None:
+        yield finish_block(block_lines, start, block_type)
+
+
+def finish_block(lines, start, block_type):
+    end = start + len(lines)
+    last_line = lines[-1].rstrip()
+    if last_line == lines[-1]:
+        return detect_block(Block(block_type, lines, start, end))
+    while last_line == "":
+        lines.pop()
+        last_line = lines[-1].rstrip()
+    lines[-1] = last_line
+    block_type = block_to_block_type("\n".join(lines))
+    return detect_block(Block(block_type, lines, start, end))
+
+
+def detect_block(block):
+    if not BLOCK_DETECTORS:
+        return block
+    for block_type, detector in BLOCK_DETECTORS.get(block.block_type, ()):
+        if detector(block.lines):
+            block.block_type = block_type
+            break
+    return block
 
 
 def block_to_block_type(block):
@@ -52,49 +161,102 @@ def block_to_block_type(block):
     return BlockType.PARAGRAPH
 
 
-def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-    children = []
-    for block in blocks:
-        html_node = block_to_html_node(block)
-        children.append(html_node)
-    return ParentNode("div", children, None)
-
-
-def block_to_html_node(block):
-    block_type = block_to_block_type(block)
-    if block_type == BlockType.PARAGRAPH:
-        return paragraph_to_html_node(block)
-    if block_type == BlockType.HEADING:
-        return heading_to_html_node(block)
-    if block_type == BlockType.CODE:
-        return code_to_html_node(block)
-    if block_type == BlockType.OLIST:
-        return olist_to_html_node(block)
-    if block_type == BlockType.ULIST:
-        return ulist_to_html_node(block)
-    if block_type == BlockType.QUOTE:
-        return quote_to_html_node(block)
-    raise ValueError("invalid block type")
-
-
-def text_to_children(text):
-    text_nodes = text_to_textnodes(text)
+def markdown_to_html_node(markdown, cache=None, images=None, arena=False):
+    if arena:
+        return markdown_to_arena(markdown, cache, images)
+    with span("markdown_parse"):
+        children = []
+        for block in scan_blocks(markdown.split("\n")):
+            with span("block_conversion"):
+                if cache is None or not is_cacheable(block, images):
+                    html_node = block_to_html_node(block, images)
+                else:
+                    html_node = cached_block_to_html_node(block, cache)
+            children.append(html_node)
+        return ParentNode("div", children, None)
+
+
+def markdown_to_arena(markdown, cache=None, images=None):
+    with span("markdown_parse"):
+        tree = ArenaTree()
+        tree.open("div")
+        for block in scan_blocks(markdown.split("\n")):
+            with span("block_conversion"):
+                if cache is None or not is_cacheable(block, images):
+                    block_to_arena(tree, block, images)
+                else:
+                    tree.append_leaf(cached_block_to_html_node(block, cache))
+        tree.close()
+        return tree.finish()
+
+
+def block_to_arena(tree, block, images=None):
+    if block.block_type == BlockType.OLIST:
+        items = [item.split(". ", 1)[1] for item in block.lines]
+        list_to_arena(tree, "ol", items, images)
+    elif block.block_type == BlockType.ULIST:
+        items = [item[2:] for item in block.lines]
+        list_to_arena(tree, "ul", items, images)
+    else:
+        tree.append_node(block_to_html_node(block, images))
+
+
+def list_to_arena(tree, tag, items, images=None):
+    tree.open(tag)
+    for text in items:
+        tree.open("li")
+        with span("inline_parse"):
+            text_nodes = text_to_textnodes(text)
+        for text_node in text_nodes:
+            tree.append_leaf(text_node_to_html_node(text_node, images))
+        tree.close()
+    tree.close()
+
+
+def cached_block_to_html_node(block, cache):
+    key = cache.key(block)
+    html = cache.get(key)
+    if html is None:
+        html = block_to_html_node(block).to_html()
+        cache.put(key, html)
+    return LeafNode(None, html)
+
+
+def is_cacheable(block, images=None):
+    if block.block_type not in CACHEABLE_BLOCK_TYPES:
+        return False
+    if images is None:
+        return True
+    return not any("![" in line for line in block.lines)
+
+
+def block_to_html_node(block, images=None):
+    if isinstance(block, str):
+        block = Block(block_to_block_type(block), block.split("\n"))
+    handler = BLOCK_HANDLERS.get(block.block_type)
+    if handler is None:
+        raise ValueError("invalid block type")
+    return handler(block.lines, images)
+
+
+def text_to_children(text, images=None):
+    with span("inline_parse"):
+        text_nodes = text_to_textnodes(text)
     children = []
     for text_node in text_nodes:
-        html_node = text_node_to_html_node(text_node)
+        html_node = text_node_to_html_node(text_node, images)
         children.append(html_node)
     return children
 
 
-def paragraph_to_html_node(block):
-    lines = block.split("\n")
+def paragraph_to_html_node(lines, images=None):
     paragraph = " ".join(lines)
-    children = text_to_children(paragraph)
+    children = text_to_children(paragraph, images)
     return ParentNode("p", children)
 
 
-def heading_to_html_node(block):
+def heading_to_html_node(lines, images=None):
+    block = lines[0] if len(lines) == 1 else "\n".join(lines)
     level = 0
     for char in block:
         if char == "#":
@@ -104,48 +266,62 @@ def heading_to_html_node(block):
     if level + 1 >= len(block):
         raise ValueError(f"invalid heading level: {level}")
     text = block[level + 1 :]
-    children = text_to_children(text)
+    children = text_to_children(text, images)
     return ParentNode(f"h{level}", children)
 
 
-def code_to_html_node(block):
-    if not block.startswith("```") or not block.endswith("```"):
+def code_to_html_node(lines, images=None):
+    if len(lines) < 2 or not lines[0].startswith("```"):
+        raise ValueError("invalid code block")
+    if not lines[-1].startswith("```"):
         raise ValueError("invalid code block")
-    text = block[4:-3]
+    text = "".join(line + "\n" for line in lines[1:-1])
+    language = fence_language(lines[0])
+    if language is not None:
+        child = LeafNode(None, highlight(text, language))
+        code = ParentNode("code", [child], {"class": f"language-{language}"})
+        return ParentNode("pre", [code])
     raw_text_node = TextNode(text, TextType.TEXT)
     child = text_node_to_html_node(raw_text_node)
     code = ParentNode("code", [child])
     return ParentNode("pre", [code])
 
 
-def olist_to_html_node(block):
-    items = block.split("\n")
+def olist_to_html_node(lines, images=None):
     html_items = []
-    for item in items:
+    for item in lines:
         parts = item.split(". ", 1)
         text = parts[1]
-        children = text_to_children(text)
+        children = text_to_children(text, images)
         html_items.append(ParentNode("li", children))
     return ParentNode("ol", html_items)
 
 
-def ulist_to_html_node(block):
-    items = block.split("\n")
+def ulist_to_html_node(lines, images=None):
     html_items = []
-    for item in items:
+    for item in lines:
         text = item[2:]
-        children = text_to_children(text)
+        children = text_to_children(text, images)
         html_items.append(ParentNode("li", children))
     return ParentNode("ul", html_items)
 
 
-def quote_to_html_node(block):
-    lines = block.split("\n")
+def quote_to_html_node(lines, images=None):
     new_lines = []
     for line in lines:
         if not line.startswith(">"):
             raise ValueError("invalid quote block")
         new_lines.append(line.lstrip(">").strip())
     content = " ".join(new_lines)
-    children = text_to_children(content)
+    children = text_to_children(content, images)
     return ParentNode("blockquote", children)
+
+
+BLOCK_HANDLERS = {
+    BlockType.PARAGRAPH: paragraph_to_html_node,
+    BlockType.HEADING: heading_to_html_node,
+    BlockType.CODE: code_to_html_node,
+    BlockType.OLIST: olist_to_html_node,
+    BlockType.ULIST: ulist_to_html_node,
+    BlockType.QUOTE: quote_to_html_node,
+}
@@ -0,0 +1,46 @@
+import hashlib
+import os
+import threading
+
+MAX_OPEN_FILES = 64
+
+open_files = threading.BoundedSemaphore(MAX_OPEN_FILES)
+
+
+def write_output(dest_path, chunks, encoding="utf-8"):
+    dest_dir_path = os.path.dirname(dest_path)
+    if dest_dir_path != "":
+        os.makedirs(dest_dir_path, exist_ok=True)
+    tmp_path = f"{dest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    digest = hashlib.sha256()
+    size = 0
+    with open_files:
+        try:
+            with open(tmp_path, "xb") as f:
+                for chunk in chunks:
+                    data = chunk.encode(encoding)
+                    digest.update(data)
+                    f.write(data)
+                    size += len(data)
+            if has_content(dest_path, size, digest.digest()):
+                os.remove(tmp_path)
+                return False
+            os.replace(tmp_path, dest_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    return True
+
+
+def has_content(path, size, digest):
+    try:
+        if os.stat(path).st_size != size:
+            return False
+        existing = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                existing.update(chunk)
+    except FileNotFoundError:
+        return False
+    return existing.digest() == digest
@@ -0,0 +1,77 @@
+import asyncio
+
+from executors import SerialExecutor
+
+
+class Pipeline:
+    def __init__(self, executor=None, renderers=1, readers=4, writers=4, queue_size=16):
+        if min(renderers, readers, writers, queue_size) < 1:
+            raise ValueError("pipeline stages need at least one worker and queue slot")
+        self.executor = executor
+        self.renderers = renderers
+        self.readers = readers
+        self.writers = writers
+        self.queue_size = queue_size
+
+    def run(self, jobs, read, render, write):
+        return asyncio.run(self.run_stages(jobs, read, render, write))
+
+    async def run_stages(self, jobs, read, render, write):
+        results = [None] * len(jobs)
+        pending = asyncio.Queue()
+        for index in range(len(jobs)):
+            pending.put_nowait(index)
+        render_queue = asyncio.Queue(self.queue_size)
+        write_queue = asyncio.Queue(self.queue_size)
+
+        async def reader():
+            while not pending.empty():
+                index = pending.get_nowait()
+                try:
+                    data = await asyncio.to_thread(read, jobs[index])
+                except Exception as e:
+                    results[index] = (None, e)
+                    continue
+                await render_queue.put((index, data))
+
+        async def renderer():
+            while True:
+                item = await render_queue.get()
+                if item is None:
+                    return
+                index, data = item
+                try:
+                    rendered = await self.render(render, jobs[index], data)
+                except Exception as e:
+                    results[index] = (None, e)
+                    continue
+                await write_queue.put((index, rendered))
+
+        async def writer():
+            while True:
+                item = await write_queue.get()
+                if item is None:
+                    return
+                index, rendered = item
+                try:
+                    result = await asyncio.to_thread(write, jobs[index], rendered)
+                except Exception as e:
+                    results[index] = (None, e)
+                    continue
+                results[index] = (result, None)
+
+        renderers = [asyncio.create_task(renderer()) for _ in range(self.renderers)]
+        writers = [asyncio.create_task(writer()) for _ in range(self.writers)]
+        await asyncio.gather(*(reader() for _ in range(self.readers)))
+        for _ in renderers:
+            await render_queue.put(None)
+        await asyncio.gather(*renderers)
+        for _ in writers:
+            await write_queue.put(None)
+        await asyncio.gather(*writers)
+        return results
+
+    async def render(self, render, job, data):
+        if self.executor is None or isinstance(self.executor, SerialExecutor):
+            return await asyncio.to_thread(render, job, data)
+        return await asyncio.wrap_future(self.executor.submit(render, job, data))
@@ -0,0 +1,78 @@
+import os
+
+
+class BuildPlan:
+    def __init__(self, pages, assets):
+        self.pages = pages
+        self.assets = assets
+
+    def page_jobs(self):
+        return [(from_path, dest_path) for from_path, dest_path, _ in self.pages]
+
+    def page_bytes(self):
+        return sum(stat.st_size for _, _, stat in self.pages)
+
+    def asset_bytes(self):
+        return sum(stat.st_size for _, _, stat in self.assets)
+
+    def format(self):
+        lines = [
+            f"Build plan: {len(self.pages)} page(s) "
+            f"({format_size(self.page_bytes())}), {len(self.assets)} asset(s) "
+            f"({format_size(self.asset_bytes())})",
+            "Pages (largest first):",
+        ]
+        lines.extend(format_jobs(self.pages))
+        lines.append("Assets (largest first):")
+        lines.extend(format_jobs(largest_first(self.assets)))
+        return "\n".join(lines)
+
+
+def plan_build(dir_path_content, dir_path_static, dest_dir_path):
+    pages = plan_pages(dir_path_content, dest_dir_path)
+    assets = plan_assets(dir_path_static, dest_dir_path)
+    return BuildPlan(largest_first(pages), assets)
+
+
+def plan_pages(dir_path_content, dest_dir_path):
+    pages = []
+    for from_path, relative_path, stat in scan_files(dir_path_content):
+        if from_path.endswith(".md"):
+            dest_path = os.path.join(dest_dir_path, relative_path)
+            pages.append((from_path, dest_path.replace(".md", ".html"), stat))
+    return pages
+
+
+def plan_assets(dir_path_static, dest_dir_path):
+    return [
+        (from_path, os.path.join(dest_dir_path, relative_path), stat)
+        for from_path, relative_path, stat in scan_files(dir_path_static)
+    ]
+
+
+def scan_files(dir_path, relative_dir_path=""):
+    with os.scandir(dir_path) as entries:
+        entries = sorted(entries, key=lambda entry: entry.name)
+    for entry in entries:
+        relative_path = os.path.join(relative_dir_path, entry.name)
+        if entry.is_dir():
+            yield from scan_files(entry.path, relative_path)
+        elif entry.is_file():
+            yield entry.path, relative_path, entry.stat()
+
+
+def largest_first(jobs):
+    return sorted(jobs, key=lambda job: job[2].st_size, reverse=True)
+
+
+def format_jobs(jobs):
+    for from_path, dest_path, stat in jobs:
+        yield f"  {format_size(stat.st_size):>10}  {from_path} -> {dest_path}"
+
+
+def format_size(size):
+    if size < 1 << 10:
+        return f"{size} B"
+    if size < 1 << 20:
+        return f"{size / (1 << 10):.1f} KB"
+    return f"{size / (1 << 20):.1f} MB"
@@ -0,0 +1,80 @@
+import html_emitter
+import inline_markdown
+from inline_markdown import BUILTIN_TOKENS, INLINE_SCANNERS, compile_markup_pattern
+from markdown_to_blocks import (
+    BLOCK_DETECTORS,
+    BLOCK_HANDLERS,
+    CACHEABLE_BLOCK_TYPES,
+    BlockType,
+)
+from textnode import TEXT_HANDLERS, TextType
+
+# Ordering contract for extensions:
+#
+# - Blocks are split and classified by the built-in scanner first. A block
+#   detector only sees blocks the scanner classified as its base type
+#   (paragraph by default). Detectors for the same base type run in
+#   registration order and the first one that returns true wins.
+# - Inline tokens are matched left to right. When several tokens start at the
+#   same position, the built-in tokens win, then registered tokens in
+#   registration order.
+# - Registering a handler for an existing block or text type replaces the
+#   built-in handler for every later render.
+#
+# Extension blocks, overridden block types and any page once an inline
+# extension is registered bypass the block cache, since the cached HTML cannot
+# reflect handler code. Extensions must be registered at import time of a
+# module the process executor's workers import too.
+
+
+class ExtensionType:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name):
+        self.name = name.upper().replace("-", "_")
+        self.value = name
+
+    def __eq__(self, other):
+        if not isinstance(other, ExtensionType):
+            return NotImplemented
+        return self.value == other.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __repr__(self):
+        return f"ExtensionType({self.value})"
+
+
+def register_block_type(name, detector, handler, base=BlockType.PARAGRAPH):
+    block_type = ExtensionType(name)
+    BLOCK_DETECTORS.setdefault(base, []).append((block_type, detector))
+    BLOCK_HANDLERS[block_type] = handler
+    return block_type
+
+
+def register_block_handler(block_type, handler):
+    BLOCK_HANDLERS[block_type] = handler
+    html_emitter.BLOCK_EMITTERS.pop(block_type, None)
+    CACHEABLE_BLOCK_TYPES.discard(block_type)
+
+
+def register_text_type(name, handler):
+    text_type = ExtensionType(name)
+    TEXT_HANDLERS[text_type] = handler
+    return text_type
+
+
+def register_text_handler(text_type, handler):
+    TEXT_HANDLERS[text_type] = handler
+    if isinstance(text_type, TextType):
+        html_emitter.fast_inline = False
+        CACHEABLE_BLOCK_TYPES.clear()
+
+
+def register_inline_syntax(token, scanner):
+    if token in BUILTIN_TOKENS:
+        raise ValueError(f"inline token is built in: {token}")
+    INLINE_SCANNERS[token] = scanner
+    inline_markdown.markup_pattern = compile_markup_pattern()
+    CACHEABLE_BLOCK_TYPES.clear()
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+
+from copystatic import sync_files
+from manifest import BuildManifest
+from output_writer import write_output
+from plan import BuildPlan, scan_files
+
+SHARD_MANIFEST_NAME = "shard-manifest.json"
+
+
+class MergeError(Exception):
+    def __init__(self, problems):
+        self.problems = problems
+        lines = [f"{len(problems)} problem(s) merging shards:"]
+        for problem in problems:
+            lines.append(f"  {problem}")
+        super().__init__("\n".join(lines))
+
+
+def parse_shard(value):
+    index, _, count = value.partition("/")
+    index, count = int(index), int(count)
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"invalid shard: {value}")
+    return index, count
+
+
+def shard_suffix(index, count):
+    return f"shard-{index}-of-{count}"
+
+
+def source_key(from_path):
+    return os.path.normpath(from_path).replace(os.sep, "/")
+
+
+def stable_hash(from_path):
+    digest = hashlib.blake2b(source_key(from_path).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def partition(jobs, count, balanced=False):
+    shards = [[] for _ in range(count)]
+    if not balanced:
+        for job in jobs:
+            shards[stable_hash(job[0]) % count].append(job)
+        return shards
+    loads = [0] * count
+    ordered = sorted(jobs, key=lambda job: (-job[2].st_size, source_key(job[0])))
+    for job in ordered:
+        shard = min(range(count), key=lambda i: (loads[i], i))
+        loads[shard] += job[2].st_size
+        shards[shard].append(job)
+    return shards
+
+
+def shard_plan(plan, index, count, balanced=False):
+    jobs = partition(plan.pages + plan.assets, count, balanced)[index - 1]
+    selected = {from_path for from_path, _, _ in jobs}
+    return BuildPlan(
+        [page for page in plan.pages if page[0] in selected],
+        [asset for asset in plan.assets if asset[0] in selected],
+    )
+
+
+def plan_outputs(plan, dest_dir_path):
+    return {
+        os.path.relpath(dest_path, dest_dir_path).replace(os.sep, "/"): (
+            source_key(from_path),
+            stat.st_size,
+        )
+        for from_path, dest_path, stat in plan.pages + plan.assets
+    }
+
+
+def write_shard_manifest(plan, shard, dest_dir_path, index, count, manifest=None):
+    outputs = plan_outputs(plan, dest_dir_path)
+    encoded = json.dumps(sorted(outputs.items())).encode()
+    info = {
+        "shard": index,
+        "count": count,
+        "plan": hashlib.sha256(encoded).hexdigest(),
+        "jobs": len(outputs),
+        "outputs": {
+            output: source
+            for output, (source, _) in plan_outputs(shard, dest_dir_path).items()
+        },
+    }
+    path = os.path.join(dest_dir_path, SHARD_MANIFEST_NAME)
+    write_output(path, [json.dumps(info, indent=2, sort_keys=True)])
+    if manifest is not None:
+        manifest.record_asset(path, path)
+    return path
+
+
+def merge_shards(
+    shard_dir_paths, dest_dir_path, link_mode="copy", workers=1, verbose=False
+):
+    problems = []
+    shards = {}
+    for shard_dir_path in shard_dir_paths:
+        path = os.path.join(shard_dir_path, SHARD_MANIFEST_NAME)
+        try:
+            with open(path) as f:
+                info = json.load(f)
+        except (OSError, ValueError) as e:
+            problems.append(f"{shard_dir_path}: unreadable shard manifest: {e}")
+            continue
+        shards.setdefault(info["shard"], []).append((shard_dir_path, info))
+    if not shards:
+        raise MergeError(problems or ["no shards given"])
+
+    infos = [info for found in shards.values() for _, info in found]
+    counts = {info["count"] for info in infos}
+    if len(counts) > 1:
+        problems.append(f"shards disagree on the shard count: {sorted(counts)}")
+    if len({info["plan"] for info in infos}) > 1:
+        problems.append("shards were built from different sources")
+    count = max(counts)
+    missing = [str(index) for index in range(1, count + 1) if index not in shards]
+    if missing:
+        problems.append(f"missing shard(s) {', '.join(missing)} of {count}")
+    for index, found in sorted(shards.items()):
+        if len(found) > 1:
+            dirs = ", ".join(shard_dir_path for shard_dir_path, _ in found)
+            problems.append(f"shard {index} given more than once: {dirs}")
+    covered = sum(len(info["outputs"]) for info in infos)
+    total = max(info["jobs"] for info in infos)
+    if not missing and covered != total:
+        problems.append(f"shards cover {covered} of {total} jobs")
+
+    owners = {}
+    jobs = []
+    for shard_dir_path in shard_dir_paths:
+        if not os.path.isdir(shard_dir_path):
+            continue
+        for from_path, relative_path, stat in scan_files(shard_dir_path):
+            output = relative_path.replace(os.sep, "/")
+            if output == SHARD_MANIFEST_NAME:
+                continue
+            if output in owners:
+                problems.append(
+                    f"{output} is written by both {owners[output]} and "
+                    f"{shard_dir_path}"
+                )
+                continue
+            owners[output] = shard_dir_path
+            jobs.append((from_path, os.path.join(dest_dir_path, relative_path), stat))
+    for _, found in sorted(shards.items()):
+        for shard_dir_path, info in found:
+            for output in sorted(info["outputs"]):
+                if output not in owners:
+                    problems.append(f"{shard_dir_path}: missing output {output}")
+    if problems:
+        raise MergeError(problems)
+    jobs.sort(key=lambda job: job[1])
+    manifest = BuildManifest(None)
+    copied = sync_files(
+        jobs, dest_dir_path, manifest, False, link_mode, workers, verbose
+    )
+    return copied, manifest.prune_untracked(dest_dir_path)
@@ -0,0 +1,82 @@
+import functools
+import os
+import re
+
+PLACEHOLDERS = {"{{ Title }}": "title", "{{ Content }}": "content"}
+placeholder_pattern = re.compile("|".join(re.escape(p) for p in PLACEHOLDERS))
+root_url_pattern = re.compile(r'(href|src)="/([^"?#]*)')
+
+
+class CompiledTemplate:
+    def __init__(self, segments, slots, basepath="/", assets=None):
+        if len(segments) != len(slots) + 1:
+            raise ValueError("invalid template: segments and slots do not match")
+        self.segments = segments
+        self.slots = slots
+        self.basepath = basepath
+        self.assets = assets
+
+    def render(self, **values):
+        return "".join(self.iter_render(**values))
+
+    def write(self, fp, **values):
+        fp.writelines(self.iter_render(**values))
+
+    def iter_render(self, **values):
+        yield self.segments[0]
+        for slot, segment in zip(self.slots, self.segments[1:]):
+            value = values[slot]
+            if not isinstance(value, str) and self.slots.count(slot) > 1:
+                value = values[slot] = "".join(value)
+            if isinstance(value, str):
+                yield rewrite_root_urls(value, self.basepath, self.assets)
+            elif self.basepath == "/" and self.assets is None:
+                yield from value
+            else:
+                for chunk in value:
+                    yield rewrite_root_urls(chunk, self.basepath, self.assets)
+            yield segment
+
+    def __repr__(self):
+        return f"CompiledTemplate({self.slots}, {self.basepath})"
+
+
+def compile_template(text, basepath="/", assets=None):
+    segments = []
+    slots = []
+    start = 0
+    for match in placeholder_pattern.finditer(text):
+        static = text[start : match.start()]
+        segments.append(rewrite_root_urls(static, basepath, assets))
+        slots.append(PLACEHOLDERS[match.group()])
+        start = match.end()
+    segments.append(rewrite_root_urls(text[start:], basepath, assets))
+    return CompiledTemplate(segments, slots, basepath, assets)
+
+
+def rewrite_root_urls(html, basepath, assets=None):
+    if assets is None:
+        if basepath == "/":
+            return html
+        html = html.replace('href="/', f'href="{basepath}')
+        return html.replace('src="/', f'src="{basepath}')
+
+    def rewrite(match):
+        url = "/" + match.group(2)
+        url = assets.get(url, url)
+        return f'{match.group(1)}="{basepath}{url[1:]}'
+
+    return root_url_pattern.sub(rewrite, html)
+
+
+def load_template(template_path, basepath="/", assets=None):
+    stat = os.stat(template_path)
+    return _load_template(
+        template_path, basepath, assets, stat.st_mtime_ns, stat.st_size
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def _load_template(template_path, basepath, assets, mtime_ns, size):
+    with open(template_path, "r") as f:
+        return compile_template(f.read(), basepath, assets)
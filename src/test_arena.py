@@ -0,0 +1,103 @@
+import io
+import random
+import unittest
+
+from arena import ArenaTree
+from block_cache import BlockCache
+from corpus import SHAPES, generate_markdown
+from htmlnode import LeafNode, ParentNode
+from markdown_to_blocks import markdown_to_html_node
+
+
+class TestArenaTree(unittest.TestCase):
+    def build(self):
+        tree = ArenaTree()
+        tree.open("div")
+        tree.open("p")
+        tree.leaf(None, "Hello ")
+        tree.leaf("a", "world", {"href": "/w"})
+        tree.close()
+        tree.leaf("b", "")
+        tree.close()
+        return tree.finish()
+
+    def test_to_html(self):
+        self.assertEqual(
+            self.build().to_html(),
+            '<div><p>Hello <a href="/w">world</a></p><b></b></div>',
+        )
+
+    def test_traversal(self):
+        root = self.build()
+        self.assertEqual(root.tag, "div")
+        self.assertIsNone(root.value)
+        self.assertIsNone(root.parent)
+        paragraph, bold = root.children
+        values = [child.value for child in paragraph.children]
+        self.assertEqual(values, ["Hello ", "world"])
+        self.assertEqual(paragraph.children[1].props, {"href": "/w"})
+        self.assertEqual(paragraph.children[1].parent, paragraph)
+        self.assertIsNone(bold.children)
+
+    def test_to_node(self):
+        self.assertEqual(
+            self.build().to_node(),
+            ParentNode(
+                "div",
+                [
+                    ParentNode(
+                        "p",
+                        [
+                            LeafNode(None, "Hello "),
+                            LeafNode("a", "world", {"href": "/w"}),
+                        ],
+                    ),
+                    LeafNode("b", ""),
+                ],
+            ),
+        )
+
+    def test_write_html(self):
+        fp = io.StringIO()
+        self.build().write_html(fp)
+        self.assertEqual(fp.getvalue(), self.build().to_html())
+
+    def test_unclosed_nodes(self):
+        tree = ArenaTree()
+        tree.open("div")
+        with self.assertRaises(ValueError):
+            tree.finish()
+
+
+class TestMarkdownToArena(unittest.TestCase):
+    def assertEquivalent(self, markdown, cache=None):
+        node = markdown_to_html_node(markdown, cache)
+        arena = markdown_to_html_node(markdown, cache, arena=True)
+        self.assertEqual(arena.to_html(), node.to_html())
+        self.assertEqual(arena.to_node(), node)
+
+    def test_generated_corpus(self):
+        for shape in SHAPES:
+            rng = random.Random(shape)
+            for _ in range(3):
+                self.assertEquivalent(generate_markdown(rng, shape))
+
+    def test_large_list(self):
+        markdown = "\n".join(f"{i}. item **{i}** [x](/{i})" for i in range(1, 2001))
+        self.assertEquivalent(markdown)
+        arena = markdown_to_html_node(markdown, arena=True)
+        self.assertEqual(len(arena.tree), 2 + 2000 * 5)
+
+    def test_block_cache(self):
+        cache = BlockCache()
+        markdown = "# T\n\n- a\n- **b**\n\n```\ncode\n```"
+        self.assertEquivalent(markdown, cache)
+        self.assertEqual(cache.hits, 3)
+
+    def test_invalid_markdown_raises(self):
+        with self.assertRaises(ValueError):
+            markdown_to_html_node("- **unclosed", arena=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
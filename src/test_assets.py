@@ -0,0 +1,127 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from assets import (
+    ASSET_MANIFEST_NAME,
+    AssetManifest,
+    fingerprint_assets,
+    fingerprint_files,
+    fingerprint_name,
+    write_asset_manifest,
+)
+from manifest import BuildManifest, hash_file
+from plan import plan_assets
+from template import compile_template
+
+
+class TestFingerprintName(unittest.TestCase):
+    def test_hash_inserted_before_extension(self):
+        self.assertEqual(
+            fingerprint_name("index.css", "0123456789ab"), "index.01234567.css"
+        )
+
+    def test_no_extension(self):
+        self.assertEqual(
+            fingerprint_name("LICENSE", "0123456789ab"), "LICENSE.01234567"
+        )
+
+
+class TestFingerprintAssets(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.docs = os.path.join(self.tmp.name, "docs")
+        os.makedirs(os.path.join(self.static, "images"))
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(os.path.join(self.static, "images", "a.png"), "png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        with open(path, "w") as f:
+            f.write(text)
+
+    def fingerprint(self, manifest=None):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fingerprint_assets(self.static, self.docs, manifest)
+
+    def test_urls_map_to_hashed_names(self):
+        assets = self.fingerprint()
+        css_hash = hash_file(os.path.join(self.static, "index.css"))[:8]
+        png_hash = hash_file(os.path.join(self.static, "images", "a.png"))[:8]
+        self.assertEqual(
+            assets.urls,
+            {
+                "/index.css": f"/index.{css_hash}.css",
+                "/images/a.png": f"/images/a.{png_hash}.png",
+            },
+        )
+        css_path = os.path.join(self.docs, f"index.{css_hash}.css")
+        self.assertTrue(os.path.isfile(css_path))
+
+    def test_planned_files_only(self):
+        planned = plan_assets(self.static, self.docs)
+        self.assertEqual(
+            self.fingerprint().urls,
+            fingerprint_files(planned, self.docs).urls,
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            assets = fingerprint_files(planned[1:], self.docs)
+        self.assertEqual(list(assets.urls), ["/index.css"])
+
+    def test_changed_content_changes_digest(self):
+        before = self.fingerprint()
+        self.assertEqual(before, self.fingerprint())
+        self.write(os.path.join(self.static, "index.css"), "body { margin: 0 }")
+        after = self.fingerprint()
+        self.assertNotEqual(before.digest, after.digest)
+        self.assertNotEqual(before.get("/index.css"), after.get("/index.css"))
+
+    def test_stale_names_are_pruned(self):
+        manifest = BuildManifest(os.path.join(self.tmp.name, "manifest.json"))
+        old = self.fingerprint(manifest).get("/index.css")
+        self.write(os.path.join(self.static, "index.css"), "body { margin: 0 }")
+        manifest.seen.clear()
+        self.fingerprint(manifest)
+        removed = manifest.prune(self.docs)
+        self.assertEqual(removed, [os.path.join(self.docs, old[1:])])
+
+    def test_asset_manifest_written(self):
+        assets = self.fingerprint()
+        path = write_asset_manifest(assets, self.docs)
+        self.assertEqual(path, os.path.join(self.docs, ASSET_MANIFEST_NAME))
+        with open(path) as f:
+            self.assertEqual(json.load(f), assets.urls)
+
+
+class TestRewriteReferences(unittest.TestCase):
+    def setUp(self):
+        self.assets = AssetManifest(
+            {"/index.css": "/index.abcd1234.css", "/images/a.png": "/images/a.ef01.png"}
+        )
+
+    def test_template_and_content_rewritten(self):
+        template = compile_template(
+            '<link href="/index.css">{{ Content }}', assets=self.assets
+        )
+        self.assertEqual(
+            template.render(title="", content='<img src="/images/a.png">'),
+            '<link href="/index.abcd1234.css"><img src="/images/a.ef01.png">',
+        )
+
+    def test_unknown_urls_only_get_basepath(self):
+        template = compile_template("{{ Content }}", "/base/", self.assets)
+        chunks = iter(['<a href="/blog/">', '<link href="/index.css?v=1">'])
+        self.assertEqual(
+            template.render(title="", content=chunks),
+            '<a href="/base/blog/"><link href="/base/index.abcd1234.css?v=1">',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import pickle
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from block_cache import BlockCache, open_block_cache
+from markdown_to_blocks import Block, BlockType, markdown_to_html_node
+
+MARKDOWN = """# Title
+
+Some **bold** and _italic_ text
+
+- one
+- two
+
+```
+code
+```
+"""
+
+
+class TestBlockCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, "blocks")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cached_render_is_identical(self):
+        cache = BlockCache(self.cache_dir)
+        expected = markdown_to_html_node(MARKDOWN).to_html()
+        self.assertEqual(markdown_to_html_node(MARKDOWN, cache).to_html(), expected)
+        self.assertEqual(markdown_to_html_node(MARKDOWN, cache).to_html(), expected)
+        self.assertEqual((cache.hits, cache.misses), (4, 4))
+
+    def test_disk_tier_survives_new_instance(self):
+        markdown_to_html_node(MARKDOWN, BlockCache(self.cache_dir))
+        cache = BlockCache(self.cache_dir)
+        markdown_to_html_node(MARKDOWN, cache)
+        self.assertEqual((cache.hits, cache.misses), (4, 0))
+
+    def test_key_depends_on_type_and_lines(self):
+        cache = BlockCache()
+        paragraph = Block(BlockType.PARAGRAPH, ["- a"])
+        ulist = Block(BlockType.ULIST, ["- a"])
+        self.assertNotEqual(cache.key(paragraph), cache.key(ulist))
+        self.assertNotEqual(
+            cache.key(Block(BlockType.PARAGRAPH, ["a", "b"])),
+            cache.key(Block(BlockType.PARAGRAPH, ["ab"])),
+        )
+
+    def test_memory_tier_is_lru(self):
+        cache = BlockCache(memory_items=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+        self.assertEqual(list(cache.memory), ["a", "c"])
+        self.assertIsNone(cache.get("b"))
+
+    def test_disk_tier_is_trimmed_to_size(self):
+        cache = BlockCache(self.cache_dir, memory_items=1, disk_bytes=1000)
+        for i in range(20):
+            cache.put(f"{i:032x}", "x" * 100)
+        usage = sum(size for _, size, _ in cache.disk_entries())
+        self.assertLessEqual(usage, 1000)
+        self.assertIsNotNone(cache.read_disk(f"{19:032x}"))
+
+    def test_concurrent_disk_writes_of_one_key(self):
+        cache = BlockCache(self.cache_dir)
+        key = "ab" * 16
+
+        def write(i):
+            for _ in range(200):
+                cache.write_disk(key, f"<p>{i}</p>")
+                cache.read_disk(key)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(write, range(4)))
+        self.assertIn(cache.read_disk(key), [f"<p>{i}</p>" for i in range(4)])
+        shard = os.path.dirname(cache.disk_path(key))
+        self.assertEqual(os.listdir(shard), [key[2:] + ".html"])
+
+    def test_concurrent_memory_tier(self):
+        cache = BlockCache(memory_items=8)
+
+        def churn(i):
+            for j in range(2000):
+                key = f"{(i * 7 + j) % 32:032x}"
+                if cache.get(key) is None:
+                    cache.put(key, key)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(churn, range(4)))
+        self.assertEqual(cache.hits + cache.misses, 8000)
+        self.assertLessEqual(len(cache.memory), 8)
+
+    def test_disk_usage_counts_bytes(self):
+        cache = BlockCache(self.cache_dir)
+        cache.put("a" * 32, "x")
+        cache.put("b" * 32, "é" * 10)
+        self.assertEqual(
+            cache.disk_usage, sum(size for _, size, _ in cache.disk_entries())
+        )
+
+    def test_pickle_reopens_process_cache(self):
+        cache = open_block_cache(self.cache_dir)
+        self.assertIs(pickle.loads(pickle.dumps(cache)), cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
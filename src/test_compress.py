@@ -0,0 +1,61 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from compress import write_gzip_sidecars
+from manifest import BuildManifest
+
+
+class TestGzipSidecars(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.manifest = BuildManifest(os.path.join(self.tmp.name, "manifest.json"))
+        self.page = self.write("index.html", "<p>hello</p>" * 200)
+        self.css = self.write("index.css", "body { margin: 0 }\n" * 100)
+        self.small = self.write("small.html", "<p>hi</p>")
+        self.image = self.write("image.png", "x" * 5000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def sidecars(self):
+        paths = [self.page, self.css, self.small, self.image]
+        return write_gzip_sidecars(paths, self.manifest, min_size=1024)
+
+    def test_compressible_files_above_threshold(self):
+        self.assertEqual(sorted(self.sidecars()), [self.css + ".gz", self.page + ".gz"])
+        with gzip.open(self.page + ".gz", "rt") as f:
+            self.assertEqual(f.read(), "<p>hello</p>" * 200)
+
+    def test_unchanged_sources_reuse_sidecars(self):
+        self.sidecars()
+        self.assertEqual(self.sidecars(), [])
+        self.write("index.css", "body { margin: 1px }\n" * 100)
+        self.assertEqual(self.sidecars(), [self.css + ".gz"])
+
+    def test_output_is_deterministic(self):
+        self.sidecars()
+        with open(self.page + ".gz", "rb") as f:
+            first = f.read()
+        os.remove(self.page + ".gz")
+        self.sidecars()
+        with open(self.page + ".gz", "rb") as f:
+            self.assertEqual(f.read(), first)
+
+    def test_sidecars_are_tracked_and_pruned(self):
+        self.sidecars()
+        self.assertIn(self.page + ".gz", self.manifest.seen)
+        self.manifest.forget(self.page)
+        self.manifest.prune(self.tmp.name)
+        self.assertFalse(os.path.exists(self.page + ".gz"))
+
+
+if __name__ == "__main__":
+    unittest.main()
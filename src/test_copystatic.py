@@ -0,0 +1,145 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import main
+
+from copystatic import copy_file, copy_range, sync_files_recursive
+from manifest import BuildManifest
+
+
+class TestSyncFilesRecursive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.docs = os.path.join(self.tmp.name, "docs")
+        self.manifest_path = os.path.join(self.tmp.name, "manifest.json")
+        os.makedirs(os.path.join(self.static, "images"))
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(os.path.join(self.static, "images", "a.png"), "png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        with open(path, "w") as f:
+            f.write(text)
+
+    def sync(self, **kwargs):
+        manifest = BuildManifest.load(self.manifest_path)
+        copied = sync_files_recursive(self.static, self.docs, manifest, **kwargs)
+        removed = manifest.prune(self.docs)
+        manifest.save()
+        return (
+            [os.path.relpath(p, self.docs) for p in copied],
+            [os.path.relpath(p, self.docs) for p in removed],
+        )
+
+    def test_first_sync_copies_everything(self):
+        self.assertEqual(self.sync(), (["images/a.png", "index.css"], []))
+
+    def test_unchanged_files_are_skipped(self):
+        self.sync()
+        self.assertEqual(self.sync(), ([], []))
+
+    def test_changed_file_is_copied(self):
+        self.sync()
+        self.write(os.path.join(self.static, "index.css"), "body { margin: 0 }")
+        self.assertEqual(self.sync(), (["index.css"], []))
+
+    def test_checksum_detects_same_size_change(self):
+        self.sync()
+        path = os.path.join(self.static, "index.css")
+        stat = os.stat(path)
+        self.write(path, "html {}")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(self.sync(), ([], []))
+        self.assertEqual(self.sync(checksum=True), (["index.css"], []))
+
+    def test_stale_assets_are_removed_but_pages_kept(self):
+        self.sync()
+        self.write(os.path.join(self.docs, "index.html"), "<p>page</p>")
+        os.remove(os.path.join(self.static, "images", "a.png"))
+        self.assertEqual(self.sync(), ([], ["images/a.png"]))
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "index.html")))
+
+    def test_hardlink_mode(self):
+        self.sync(link_mode="hardlink")
+        source = os.stat(os.path.join(self.static, "index.css"))
+        dest = os.stat(os.path.join(self.docs, "index.css"))
+        self.assertEqual(source.st_ino, dest.st_ino)
+
+    def test_reflink_mode_falls_back_to_copy(self):
+        self.sync(link_mode="reflink")
+        with open(os.path.join(self.docs, "images", "a.png")) as f:
+            self.assertEqual(f.read(), "png")
+
+    def test_invalid_link_mode(self):
+        with self.assertRaises(ValueError):
+            self.sync(link_mode="symlink")
+
+    def test_parallel_sync_matches_serial(self):
+        os.makedirs(os.path.join(self.static, "media"))
+        for i in range(20):
+            self.write(os.path.join(self.static, "media", f"{i}.bin"), "x" * i * 100)
+        copied, _ = self.sync(workers=4)
+        self.assertEqual(len(copied), 22)
+        self.assertEqual(copied, sorted(copied, key=lambda p: p.split(os.sep)))
+        with open(os.path.join(self.docs, "media", "19.bin")) as f:
+            self.assertEqual(f.read(), "x" * 1900)
+        self.assertEqual(self.sync(workers=4), ([], []))
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            self.sync(workers=0)
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                main.main(["--copy-jobs", "-1"])
+
+    def test_copied_files_printed_only_when_verbose(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.sync(workers=2)
+        self.assertEqual(output.getvalue(), "")
+        self.write(os.path.join(self.static, "index.css"), "body { margin: 0 }")
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.sync(verbose=True)
+        self.assertIn("index.css", output.getvalue())
+
+
+class TestCopyFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "source")
+        self.dest = os.path.join(self.tmp.name, "dest")
+        self.data = os.urandom(3 << 20)
+        with open(self.source, "wb") as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_copy_file(self):
+        os.utime(self.source, ns=(1, 1_000_000_000))
+        copy_file(self.source, self.dest)
+        with open(self.dest, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertEqual(os.stat(self.dest).st_mtime_ns, 1_000_000_000)
+
+    def test_copy_range_finishes_past_expected_size(self):
+        with open(self.source, "rb") as from_file, open(self.dest, "wb") as dest_file:
+            copy_range(from_file, dest_file, 1 << 20)
+        with open(self.dest, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+
+    def test_copy_range_buffered_fallback(self):
+        with open(self.source, "rb") as from_file, open(self.dest, "wb") as dest_file:
+            copy_range(from_file, dest_file, 0)
+        with open(self.dest, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+
+
+if __name__ == "__main__":
+    unittest.main()
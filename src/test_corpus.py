@@ -0,0 +1,43 @@
+import os
+import random
+import tempfile
+import unittest
+
+from corpus import SHAPES, generate_markdown, generate_site
+from markdown_to_blocks import markdown_to_html_node
+from generate_page import extract_title
+
+
+class TestGenerateMarkdown(unittest.TestCase):
+    def test_every_shape_renders(self):
+        for shape in SHAPES:
+            with self.subTest(shape=shape):
+                markdown = generate_markdown(random.Random(0), shape, blocks=30)
+                extract_title(markdown)
+                self.assertTrue(markdown_to_html_node(markdown).to_html())
+
+    def test_same_seed_same_output(self):
+        self.assertEqual(
+            generate_markdown(random.Random(7), "inline-heavy"),
+            generate_markdown(random.Random(7), "inline-heavy"),
+        )
+
+    def test_invalid_shape(self):
+        with self.assertRaises(ValueError):
+            generate_markdown(random.Random(0), "tiny")
+
+
+class TestGenerateSite(unittest.TestCase):
+    def test_site_layout(self):
+        with tempfile.TemporaryDirectory() as root:
+            generate_site(root, "many-small", pages=12)
+            pages = []
+            for dir_path, _, filenames in os.walk(os.path.join(root, "content")):
+                pages.extend(name for name in filenames if name.endswith(".md"))
+            self.assertEqual(len(pages), 12)
+            self.assertTrue(os.path.isfile(os.path.join(root, "template.html")))
+            self.assertTrue(os.path.isfile(os.path.join(root, "static", "index.css")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+from executors import SerialExecutor, gil_enabled, make_executor
+from generate_page import BuildError, generate_pages_recursive
+
+
+class TestMakeExecutor(unittest.TestCase):
+    def test_serial_for_one_job(self):
+        self.assertIsInstance(make_executor("auto", 1), SerialExecutor)
+
+    def test_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            make_executor("gpu", 2)
+
+    def test_invalid_jobs(self):
+        with self.assertRaises(ValueError):
+            make_executor("thread", 0)
+
+    @unittest.skipUnless(gil_enabled(), "GIL が無効なビルドでは利用できる")
+    def test_free_threaded_requires_no_gil(self):
+        with self.assertRaises(ValueError):
+            make_executor("free-threaded", 2)
+
+
+class TestParallelBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.template = os.path.join(root, "template.html")
+        with open(self.template, "w") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        for i in range(8):
+            page_dir = os.path.join(self.content, f"page{i}")
+            os.makedirs(page_dir)
+            with open(os.path.join(page_dir, "index.md"), "w") as f:
+                f.write(f"# Page {i}\n\nSome **bold** text number {i}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, backend, dest):
+        with make_executor(backend, 4) as executor:
+            generate_pages_recursive(
+                self.content, self.template, dest, "/", None, executor
+            )
+        outputs = {}
+        for i in range(8):
+            with open(os.path.join(dest, f"page{i}", "index.html")) as f:
+                outputs[i] = f.read()
+        return outputs
+
+    def test_backends_produce_identical_output(self):
+        serial = self.build("serial", os.path.join(self.tmp.name, "serial"))
+        for backend in ["thread", "process"]:
+            with self.subTest(backend=backend):
+                dest = os.path.join(self.tmp.name, backend)
+                self.assertEqual(self.build(backend, dest), serial)
+
+    def test_errors_are_collected_per_page(self):
+        for i in [2, 5]:
+            with open(os.path.join(self.content, f"page{i}", "index.md"), "w") as f:
+                f.write("no title here")
+        dest = os.path.join(self.tmp.name, "docs")
+        with self.assertRaises(BuildError) as cm:
+            with make_executor("thread", 4) as executor:
+                generate_pages_recursive(
+                    self.content, self.template, dest, "/", None, executor
+                )
+        failed = [os.path.basename(os.path.dirname(p)) for p, _ in cm.exception.errors]
+        self.assertEqual(failed, ["page2", "page5"])
+        self.assertTrue(os.path.exists(os.path.join(dest, "page7", "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import highlight
+from highlight import fence_language, tokenize
+from html_emitter import markdown_to_html
+from markdown_to_blocks import markdown_to_html_node
+
+
+class TestFenceLanguage(unittest.TestCase):
+    def test_languages_and_aliases(self):
+        self.assertEqual(fence_language("```python"), "python")
+        self.assertEqual(fence_language("``` py title=x"), "python")
+        self.assertEqual(fence_language("```Bash"), "shell")
+        self.assertEqual(fence_language("```json"), "json")
+
+    def test_unknown_or_missing(self):
+        self.assertIsNone(fence_language("```"))
+        self.assertIsNone(fence_language("```rust"))
+
+
+class TestTokenize(unittest.TestCase):
+    def test_python(self):
+        self.assertEqual(
+            tokenize("def f(): return 'x' # <done>\n", "python"),
+            '<span class="hl-keyword">def</span> f(): '
+            '<span class="hl-keyword">return</span> '
+            '<span class="hl-string">\'x\'</span> '
+            '<span class="hl-comment"># &lt;done&gt;</span>\n',
+        )
+
+    def test_shell(self):
+        self.assertEqual(
+            tokenize('echo "$HOME" $1', "shell"),
+            '<span class="hl-builtin">echo</span> '
+            '<span class="hl-string">"$HOME"</span> '
+            '<span class="hl-variable">$1</span>',
+        )
+
+    def test_json(self):
+        self.assertEqual(
+            tokenize('{"a": [1, true]}', "json"),
+            '{<span class="hl-property">"a"</span>: [<span class="hl-number">1</span>, '
+            '<span class="hl-literal">true</span>]}',
+        )
+
+    def test_html(self):
+        self.assertEqual(
+            tokenize('<a href="/x">&amp;</a>', "html"),
+            '<span class="hl-tag">&lt;a</span> <span class="hl-attr">href</span>='
+            '<span class="hl-string">"/x"</span><span class="hl-tag">&gt;</span>'
+            '<span class="hl-literal">&amp;amp;</span>'
+            '<span class="hl-tag">&lt;/a</span>'
+            '<span class="hl-tag">&gt;</span>',
+        )
+
+    def test_css(self):
+        self.assertEqual(
+            tokenize("a:hover { color: #fff; }", "css"),
+            'a:hover { <span class="hl-property">color</span>: '
+            '<span class="hl-number">#fff</span>; }',
+        )
+
+    def test_plain_text_is_escaped(self):
+        self.assertEqual(tokenize("a < b", "python"), "a &lt; b")
+
+
+class TestHighlightedBlocks(unittest.TestCase):
+    def test_memoized_by_language_and_code(self):
+        highlight.highlighted.clear()
+        first = highlight.highlight("x = 1\n", "python")
+        self.assertIs(highlight.highlight("x = 1\n", "python"), first)
+        highlight.highlight("x = 1\n", "shell")
+        self.assertEqual(len(highlight.highlighted), 2)
+
+    def test_concurrent_highlighting(self):
+        highlight.highlighted.clear()
+        self.addCleanup(setattr, highlight, "MAX_CACHED", highlight.MAX_CACHED)
+        highlight.MAX_CACHED = 4
+
+        def render(i):
+            for j in range(500):
+                code = f"x = {(i + j) % 16}\n"
+                self.assertIn("hl-number", highlight.highlight(code, "python"))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(render, range(4)))
+        self.assertLessEqual(len(highlight.highlighted), 4)
+
+    def test_rendered_in_both_paths(self):
+        markdown = "```py\nif x < 1:\n    pass\n```"
+        expected = (
+            '<div><pre><code class="language-python">'
+            '<span class="hl-keyword">if</span> x &lt; '
+            '<span class="hl-number">1</span>:\n'
+            '    <span class="hl-keyword">pass</span>\n</code></pre></div>'
+        )
+        self.assertEqual(markdown_to_html_node(markdown).to_html(), expected)
+        self.assertEqual(markdown_to_html(markdown), expected)
+
+    def test_unknown_language_unchanged(self):
+        self.assertEqual(
+            markdown_to_html("```rust\nfn main() {}\n```"),
+            "<div><pre><code>fn main() {}\n</code></pre></div>",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import ast
+import os
+import random
+import unittest
+
+from block_cache import BlockCache
+from images import ImageIndex
+from corpus import SHAPES, generate_markdown
+from html_emitter import inline_to_html, markdown_to_html, markdown_to_html_chunks
+from markdown_to_blocks import markdown_to_html_node
+
+TEST_SOURCES = ["test_markdown_to_html.py", "test_markdown_to_blocks.py"]
+
+FRAGMENTS = [
+    "# Heading",
+    "###### Six",
+    "####### Seven",
+    "#",
+    "> quote",
+    "> quote\n>",
+    "> quote\nnot quote",
+    "- item",
+    "- item\n- **bold** item",
+    "- item\nnot item",
+    "1. one\n2. two",
+    "1. one\n3. three",
+    "```\ncode _x_\n```",
+    "```\nunclosed",
+    "```py\n\n\n```",
+    "```python\nx = 1  # <c>\n```",
+    "plain text",
+    "**bold** and _italic_ and `code`",
+    "[link](https://example.com) and ![image](/images/a.png)",
+    "![not closed](",
+    "**unclosed",
+    "****",
+    "text with ! and [ and ]",
+    "   ",
+    "\t# indented",
+]
+
+
+def existing_markdowns():
+    markdowns = []
+    dir_path = os.path.dirname(os.path.abspath(__file__))
+    for filename in TEST_SOURCES:
+        with open(os.path.join(dir_path, filename)) as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                markdowns.append(node.value)
+    return markdowns
+
+
+def render_ast(markdown):
+    try:
+        return markdown_to_html_node(markdown).to_html()
+    except Exception as e:
+        return type(e)
+
+
+def render_fast(markdown):
+    try:
+        return markdown_to_html(markdown)
+    except Exception as e:
+        return type(e)
+
+
+class TestDifferential(unittest.TestCase):
+    def assertSameOutput(self, markdown):
+        self.assertEqual(render_fast(markdown), render_ast(markdown), repr(markdown))
+
+    def test_existing_test_inputs(self):
+        markdowns = existing_markdowns()
+        self.assertGreater(len(markdowns), 50)
+        for markdown in markdowns:
+            self.assertSameOutput(markdown)
+
+    def test_generated_corpus(self):
+        for shape in SHAPES:
+            rng = random.Random(shape)
+            for _ in range(3):
+                self.assertSameOutput(generate_markdown(rng, shape))
+
+    def test_random_fragments(self):
+        rng = random.Random(0)
+        for _ in range(2000):
+            parts = rng.choices(FRAGMENTS, k=rng.randint(1, 6))
+            separators = rng.choices(["\n", "\n\n", "\n \n", " "], k=len(parts))
+            markdown = "".join(p + s for p, s in zip(parts, separators))
+            self.assertSameOutput(markdown)
+
+
+class TestHtmlEmitter(unittest.TestCase):
+    def test_inline(self):
+        self.assertEqual(
+            inline_to_html("a **b** [c](/d)"), 'a <b>b</b> <a href="/d">c</a>'
+        )
+
+    def test_chunks_per_block(self):
+        self.assertEqual(
+            markdown_to_html_chunks("# T\n\ntext"),
+            ["<div>", "<h1>T</h1>", "<p>text</p>", "</div>"],
+        )
+
+    def test_image_attributes(self):
+        images = ImageIndex()
+        images.urls = {"/a.png": (4, 3)}
+        markdown = "![a](/a.png) ![b](/b.png)\n\n- ![a](/a.png)"
+        self.assertEqual(
+            markdown_to_html(markdown, images=images.for_page()),
+            markdown_to_html_node(markdown, images=images.for_page()).to_html(),
+        )
+
+    def test_block_cache_shared_with_ast_path(self):
+        cache = BlockCache()
+        markdown = "# T\n\n- a\n- b"
+        expected = markdown_to_html_node(markdown, cache).to_html()
+        hits = cache.hits
+        self.assertEqual(markdown_to_html(markdown, cache), expected)
+        self.assertEqual(cache.hits, hits + 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
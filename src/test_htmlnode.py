@@ -1,3 +1,4 @@
+import io
 import unittest
 
 from htmlnode import HTMLNode, LeafNode, ParentNode
@@ -45,6 +46,65 @@ class TestParentNode(unittest.TestCase):
             "<div><span><b>grandchild</b></span></div>",
         )
 
+    def test_iter_html_streams_chunks(self):
+        node = ParentNode(
+            "ul",
+            [ParentNode("li", [LeafNode("a", "x", {"href": "/x", "class": "y"})])],
+        )
+        self.assertEqual(
+            list(node.iter_html()),
+            ["<ul>", "<li>", '<a href="/x" class="y">x</a>', "</li>", "</ul>"],
+        )
+
+    def test_write_html(self):
+        node = ParentNode("p", [LeafNode(None, "a "), LeafNode("b", "bold")])
+        buffer = io.StringIO()
+        node.write_html(buffer)
+        self.assertEqual(buffer.getvalue(), node.to_html())
+
+    def test_to_html_no_children_raises(self):
+        with self.assertRaises(ValueError):
+            ParentNode("div", None).to_html()
+
+
+class TestNodeStructure(unittest.TestCase):
+    def test_nodes_have_no_instance_dict(self):
+        for node in [
+            HTMLNode("p", "x"),
+            LeafNode("b", "x"),
+            ParentNode("div", []),
+        ]:
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_tags_are_interned(self):
+        level = 2
+        self.assertIs(LeafNode(f"h{level}", "x").tag, LeafNode("h2", "y").tag)
+
+    def test_empty_props_are_shared(self):
+        self.assertIsNone(LeafNode("p", "x", {}).props)
+
+    def test_structural_equality(self):
+        def tree():
+            return ParentNode(
+                "p", [LeafNode(None, "a "), LeafNode("a", "b", {"href": "/c"})]
+            )
+
+        self.assertEqual(tree(), tree())
+        self.assertNotEqual(tree(), ParentNode("p", [LeafNode(None, "a ")]))
+        self.assertNotEqual(LeafNode("p", "x"), ParentNode("p", []))
+
+    def test_nodes_are_hashable(self):
+        node = LeafNode("p", "x")
+        self.assertEqual({node: 1}[node], 1)
+        self.assertEqual(len({LeafNode("p", "x"), LeafNode("p", "x")}), 2)
+
+    def test_freeze(self):
+        node = ParentNode("div", [LeafNode("a", "x", {"href": "/x"})]).freeze()
+        self.assertIsInstance(node.children, tuple)
+        with self.assertRaises(TypeError):
+            node.children[0].props["href"] = "/y"
+        self.assertEqual(node.to_html(), '<div><a href="/x">x</a></div>')
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,161 @@
+import os
+import struct
+import tempfile
+import unittest
+
+from block_cache import BlockCache
+from images import ImageIndex, read_image_size
+from markdown_to_blocks import markdown_to_html_node
+from plan import plan_assets
+
+
+def png(width, height):
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + struct.pack(">I", 13)
+        + b"IHDR"
+        + struct.pack(">II", width, height)
+        + b"\x08\x02\x00\x00\x00"
+    )
+
+
+def gif(width, height):
+    return b"GIF89a" + struct.pack("<HH", width, height) + b"\x00" * 8
+
+
+def jpeg(width, height):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    sof = b"\xff\xc2" + struct.pack(">HBHH", 11, 8, height, width) + b"\x00" * 4
+    return b"\xff\xd8" + app0 + sof + b"\xff\xd9"
+
+
+def webp(chunk, payload):
+    data = chunk + struct.pack("<I", len(payload)) + payload
+    return b"RIFF" + struct.pack("<I", len(data) + 4) + b"WEBP" + data
+
+
+class TestReadImageSize(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def size(self, data):
+        path = os.path.join(self.tmp.name, "image")
+        with open(path, "wb") as f:
+            f.write(data)
+        return read_image_size(path)
+
+    def test_png(self):
+        self.assertEqual(self.size(png(1026, 388)), (1026, 388))
+
+    def test_gif(self):
+        self.assertEqual(self.size(gif(16, 9)), (16, 9))
+
+    def test_jpeg_skips_segments_before_sof(self):
+        self.assertEqual(self.size(jpeg(640, 480)), (640, 480))
+
+    def test_webp_lossy(self):
+        frame = b"\x00\x00\x00\x9d\x01\x2a" + struct.pack("<HH", 300, 200)
+        self.assertEqual(self.size(webp(b"VP8 ", frame)), (300, 200))
+
+    def test_webp_lossless(self):
+        bits = (300 - 1) | ((200 - 1) << 14)
+        frame = b"\x2f" + bits.to_bytes(4, "little")
+        self.assertEqual(self.size(webp(b"VP8L", frame)), (300, 200))
+
+    def test_webp_extended(self):
+        header = b"\x00" * 4 + (299).to_bytes(3, "little") + (199).to_bytes(3, "little")
+        self.assertEqual(self.size(webp(b"VP8X", header)), (300, 200))
+
+    def test_unknown_format(self):
+        self.assertIsNone(self.size(b"not an image"))
+
+
+class TestImageIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.index_path = os.path.join(self.tmp.name, "images.json")
+        os.makedirs(os.path.join(self.static, "images"))
+        self.write("images/a.png", png(40, 30))
+        self.write("images/b.gif", gif(20, 10))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relative_path, data):
+        with open(os.path.join(self.static, relative_path), "wb") as f:
+            f.write(data)
+
+    def scan(self, eager=1):
+        images = ImageIndex.load(self.index_path, eager).scan(self.static)
+        images.save()
+        return images
+
+    def test_urls_indexed(self):
+        images = self.scan()
+        self.assertEqual(images.size("/images/a.png"), (40, 30))
+        self.assertEqual(images.size("/images/b.gif"), (20, 10))
+        self.assertIsNone(images.size("/images/missing.png"))
+
+    def test_sizes_cached_by_path_size_and_mtime(self):
+        self.scan()
+        index = ImageIndex.load(self.index_path)
+        self.assertEqual(sorted(index.sizes), ["images/a.png", "images/b.gif"])
+        index.sizes["images/a.png"][2:] = [1, 1]
+        index.save()
+        self.assertEqual(self.scan().size("/images/a.png"), (1, 1))
+        path = os.path.join(self.static, "images", "a.png")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertEqual(self.scan().size("/images/a.png"), (40, 30))
+
+    def test_scan_planned_assets(self):
+        planned = plan_assets(self.static, self.static)
+        images = ImageIndex().scan(self.static, assets=planned[:1])
+        self.assertEqual(list(images.urls), ["/images/a.png"])
+
+    def test_digest_tracks_dimensions(self):
+        before = self.scan().digest
+        self.assertEqual(ImageIndex.load(self.index_path).index().digest, before)
+        self.write("images/a.png", png(41, 30))
+        self.assertNotEqual(before, self.scan().digest)
+
+    def test_first_image_is_eager(self):
+        page = self.scan().for_page()
+        self.assertEqual(
+            page.props("/images/a.png", "a"),
+            {
+                "src": "/images/a.png",
+                "alt": "a",
+                "width": "40",
+                "height": "30",
+                "decoding": "async",
+            },
+        )
+        self.assertEqual(page.props("/images/b.gif", "b")["loading"], "lazy")
+
+    def test_markdown_rendering(self):
+        images = self.scan(eager=0)
+        node = markdown_to_html_node("![a](/images/a.png)", images=images.for_page())
+        self.assertEqual(
+            node.to_html(),
+            '<div><p><img src="/images/a.png" alt="a" width="40" height="30" '
+            'loading="lazy" decoding="async"></img></p></div>',
+        )
+
+    def test_image_blocks_bypass_block_cache(self):
+        cache = BlockCache()
+        markdown = "![a](/images/a.png)\n\n![b](/images/b.gif)"
+        for _ in range(2):
+            html = markdown_to_html_node(
+                markdown, cache, self.scan().for_page()
+            ).to_html()
+            self.assertEqual(html.count('loading="lazy"'), 1)
+        self.assertEqual(len(cache.memory), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+
+import manifest
+from generate_page import generate_pages_recursive
+from manifest import BuildManifest
+
+
+class RecordingManifest(BuildManifest):
+    def __init__(self, path, *tables):
+        super().__init__(path, *tables)
+        self.built = []
+
+    def record(self, dest_path, entry):
+        self.built.append(dest_path)
+        super().record(dest_path, entry)
+
+
+class TestIncrementalBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.docs = os.path.join(root, "docs")
+        self.template = os.path.join(root, "template.html")
+        self.manifest_path = os.path.join(root, "cache", "manifest.json")
+        os.makedirs(os.path.join(self.content, "blog"))
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nhello")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\npost")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        with open(path, "w") as f:
+            f.write(text)
+
+    def build(self):
+        manifest = RecordingManifest.load(self.manifest_path)
+        generate_pages_recursive(self.content, self.template, self.docs, "/", manifest)
+        removed = manifest.prune(self.docs)
+        manifest.save()
+        built = sorted(os.path.relpath(p, self.docs) for p in manifest.built)
+        return built, [os.path.relpath(p, self.docs) for p in removed]
+
+    def test_first_build_renders_everything(self):
+        built, removed = self.build()
+        self.assertEqual(built, ["blog/index.html", "index.html"])
+        self.assertEqual(removed, [])
+
+    def test_unchanged_build_renders_nothing(self):
+        self.build()
+        self.assertEqual(self.build(), ([], []))
+
+    def test_only_changed_page_is_rendered(self):
+        self.build()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nchanged")
+        self.assertEqual(self.build(), (["index.html"], []))
+
+    def test_template_change_renders_everything(self):
+        self.build()
+        self.write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        built, _ = self.build()
+        self.assertEqual(built, ["blog/index.html", "index.html"])
+
+    def test_renderer_change_renders_everything(self):
+        self.build()
+        version = manifest.RENDERER_VERSION
+        self.addCleanup(setattr, manifest, "RENDERER_VERSION", version)
+        manifest.RENDERER_VERSION = version + "-next"
+        self.assertEqual(self.build(), (["blog/index.html", "index.html"], []))
+
+    def test_missing_output_is_rendered(self):
+        self.build()
+        os.remove(os.path.join(self.docs, "index.html"))
+        self.assertEqual(self.build(), (["index.html"], []))
+
+    def test_removed_source_deletes_output(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "index.md"))
+        self.assertEqual(self.build(), ([], ["blog/index.html"]))
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog")))
+
+    def test_prune_untracked_removes_unknown_files(self):
+        self.build()
+        stray = os.path.join(self.docs, "old", "page.html")
+        os.makedirs(os.path.dirname(stray))
+        self.write(stray, "stale")
+        manifest = BuildManifest(self.manifest_path)
+        generate_pages_recursive(self.content, self.template, self.docs, "/", manifest)
+        self.assertEqual(manifest.prune_untracked(self.docs), [stray])
+        self.assertFalse(os.path.exists(os.path.dirname(stray)))
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
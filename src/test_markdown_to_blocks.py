@@ -1,6 +1,12 @@
 import unittest
 
-from markdown_to_blocks import markdown_to_blocks
+from markdown_to_blocks import (
+    Block,
+    BlockType,
+    markdown_to_blocks,
+    markdown_to_html_node,
+    scan_blocks,
+)
 
 
 class TestMarkdownToBlocks(unittest.TestCase):
@@ -23,3 +29,59 @@ This is the same paragraph on a new line
                 "- This is a list\n- with items",
             ],
         )
+
+    def test_blank_lines_and_whitespace_are_collapsed(self):
+        md = "\n\n\n  # Title  \n\n\n\nparagraph\n   \n"
+        self.assertEqual(markdown_to_blocks(md), ["# Title", "paragraph"])
+
+    def test_fenced_code_keeps_blank_lines(self):
+        md = "intro\n\n```\nfirst\n\nsecond\n```\n\noutro"
+        self.assertEqual(
+            markdown_to_blocks(md),
+            ["intro", "```\nfirst\n\nsecond\n```", "outro"],
+        )
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><p>intro</p><pre><code>first\n\nsecond\n</code></pre><p>outro</p></div>",
+        )
+
+    def test_unclosed_fence_falls_back_to_paragraphs(self):
+        md = "```\nno end\n\ntext"
+        self.assertEqual(markdown_to_blocks(md), ["```\nno end", "text"])
+
+
+class TestScanBlocks(unittest.TestCase):
+    def test_block_types_and_spans(self):
+        lines = [
+            "# Title",
+            "",
+            "- a",
+            "- b",
+            "",
+            "1. one",
+            "3. three",
+            "",
+            "> quote",
+            "",
+            "```",
+            "code",
+            "```",
+        ]
+        self.assertEqual(
+            list(scan_blocks(lines)),
+            [
+                Block(BlockType.HEADING, ["# Title"], 0, 1),
+                Block(BlockType.ULIST, ["- a", "- b"], 2, 4),
+                Block(BlockType.PARAGRAPH, ["1. one", "3. three"], 5, 7),
+                Block(BlockType.QUOTE, ["> quote"], 8, 9),
+                Block(BlockType.CODE, ["```", "code", "```"], 10, 13),
+            ],
+        )
+
+    def test_accepts_any_line_iterable(self):
+        blocks = scan_blocks(iter(["a", "b", "", "c"]))
+        self.assertEqual([block.text for block in blocks], ["a\nb", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
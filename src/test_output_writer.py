@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+
+from output_writer import write_output
+
+
+class TestWriteOutput(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "a", "index.html")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self):
+        with open(self.path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_writes_chunks(self):
+        self.assertTrue(write_output(self.path, ["<p>", "héllo", "</p>"]))
+        self.assertEqual(self.read(), "<p>héllo</p>")
+
+    def test_identical_content_is_not_rewritten(self):
+        write_output(self.path, ["<p>same</p>"])
+        os.utime(self.path, ns=(1, 1))
+        self.assertFalse(write_output(self.path, ["<p>", "same", "</p>"]))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 1)
+
+    def test_changed_content_is_replaced(self):
+        write_output(self.path, ["<p>old</p>"])
+        self.assertTrue(write_output(self.path, ["<p>new</p>"]))
+        self.assertEqual(self.read(), "<p>new</p>")
+
+    def test_failure_keeps_old_file_and_removes_temp(self):
+        write_output(self.path, ["<p>old</p>"])
+
+        def chunks():
+            yield "<p>partial"
+            raise ValueError("render failed")
+
+        with self.assertRaises(ValueError):
+            write_output(self.path, chunks())
+        self.assertEqual(self.read(), "<p>old</p>")
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["index.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
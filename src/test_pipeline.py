@@ -0,0 +1,160 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from generate_page import BuildError, generate_pages
+from pipeline import Pipeline
+
+
+class ConcurrencyCounter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def __exit__(self, exc_type, exc, tb):
+        with self.lock:
+            self.active -= 1
+        return False
+
+
+class TestPipeline(unittest.TestCase):
+    def test_results_in_job_order(self):
+        pipeline = Pipeline(readers=3, writers=2)
+        results = pipeline.run(
+            list(range(10)),
+            lambda job: job * 2,
+            lambda job, data: data + 1,
+            lambda job, rendered: (job, rendered),
+        )
+        self.assertEqual(results, [((job, job * 2 + 1), None) for job in range(10)])
+
+    def test_errors_are_reported_per_job(self):
+        def read(job):
+            if job == 1:
+                raise OSError("unreadable")
+            return job
+
+        def render(job, data):
+            if job == 2:
+                raise ValueError("bad markdown")
+            return data
+
+        results = Pipeline().run([0, 1, 2, 3], read, render, lambda job, data: data)
+        self.assertEqual(results[0], (0, None))
+        self.assertIsInstance(results[1][1], OSError)
+        self.assertIsInstance(results[2][1], ValueError)
+        self.assertEqual(results[3], (3, None))
+
+    def test_stage_concurrency(self):
+        reads = ConcurrencyCounter()
+        writes = ConcurrencyCounter()
+
+        def read(job):
+            with reads:
+                time.sleep(0.01)
+            return job
+
+        def write(job, rendered):
+            with writes:
+                time.sleep(0.01)
+            return rendered
+
+        Pipeline(readers=3, writers=2).run(
+            list(range(12)), read, lambda job, data: data, write
+        )
+        self.assertEqual(reads.peak, 3)
+        self.assertEqual(writes.peak, 2)
+
+    def test_backpressure(self):
+        read_count = 0
+        written = threading.Event()
+        ahead = []
+
+        def read(job):
+            nonlocal read_count
+            read_count += 1
+            if not written.is_set():
+                ahead.append(read_count)
+            return job
+
+        def write(job, rendered):
+            time.sleep(0.005)
+            written.set()
+            return rendered
+
+        Pipeline(readers=1, writers=1, queue_size=2).run(
+            list(range(20)), read, lambda job, data: data, write
+        )
+        self.assertLessEqual(max(ahead), 1 + 2 + 1 + 2 + 1)
+
+    def test_render_executor(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = Pipeline(executor, renderers=2).run(
+                [1, 2, 3],
+                lambda job: job,
+                lambda job, data: threading.current_thread().name,
+                lambda job, rendered: rendered,
+            )
+        for name, error in results:
+            self.assertIsNone(error)
+            self.assertTrue(name.startswith("ThreadPoolExecutor"))
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            Pipeline(readers=0)
+
+
+class TestPipelinedPages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.template = os.path.join(self.tmp.name, "template.html")
+        with open(self.template, "w") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        self.pages = []
+        for i in range(5):
+            from_path = os.path.join(self.tmp.name, f"{i}.md")
+            with open(from_path, "w") as f:
+                f.write(f"# Page {i}\n\nText **{i}**\n")
+            dest_path = os.path.join(self.tmp.name, "docs", f"{i}.html")
+            self.pages.append((from_path, dest_path))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def generate(self, pages, executor=None):
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(pages, self.template, executor=executor)
+        outputs = []
+        for _, dest_path in pages:
+            with open(dest_path) as f:
+                outputs.append(f.read())
+        return outputs
+
+    def test_matches_executor_output(self):
+        expected = self.generate(self.pages)
+        for _, dest_path in self.pages:
+            os.remove(dest_path)
+        self.assertEqual(self.generate(self.pages, Pipeline()), expected)
+
+    def test_build_error(self):
+        with open(self.pages[2][0], "w") as f:
+            f.write("no title\n")
+        with self.assertRaises(BuildError) as raised:
+            self.generate(self.pages, Pipeline())
+        failed = [from_path for from_path, _ in raised.exception.errors]
+        self.assertEqual(failed, [self.pages[2][0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+
+from generate_page import find_pages
+from plan import format_size, largest_first, plan_build
+
+
+class TestBuildPlan(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.static = os.path.join(self.tmp.name, "static")
+        self.docs = os.path.join(self.tmp.name, "docs")
+        self.write(os.path.join(self.content, "index.md"), "# Home\n")
+        self.write(os.path.join(self.content, "notes.txt"), "not a page")
+        self.write(os.path.join(self.content, "blog", "b", "index.md"), "# B\n" * 50)
+        self.write(os.path.join(self.content, "blog", "a.md"), "# A\n" * 10)
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(os.path.join(self.static, "images", "big.png"), "x" * 4096)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def relative(self, jobs):
+        return [
+            (os.path.relpath(from_path, self.tmp.name), stat.st_size)
+            for from_path, _, stat in jobs
+        ]
+
+    def test_pages_are_scheduled_largest_first(self):
+        plan = plan_build(self.content, self.static, self.docs)
+        self.assertEqual(
+            self.relative(plan.pages),
+            [
+                ("content/blog/b/index.md", 200),
+                ("content/blog/a.md", 40),
+                ("content/index.md", 7),
+            ],
+        )
+        self.assertEqual(
+            plan.page_jobs()[0],
+            (
+                os.path.join(self.content, "blog", "b", "index.md"),
+                os.path.join(self.docs, "blog", "b", "index.html"),
+            ),
+        )
+        self.assertEqual(plan.page_bytes(), 247)
+
+    def test_assets_keep_walk_order(self):
+        plan = plan_build(self.content, self.static, self.docs)
+        self.assertEqual(
+            self.relative(plan.assets),
+            [("static/images/big.png", 4096), ("static/index.css", 7)],
+        )
+        self.assertEqual(
+            [dest_path for _, dest_path, _ in plan.assets],
+            [
+                os.path.join(self.docs, "images", "big.png"),
+                os.path.join(self.docs, "index.css"),
+            ],
+        )
+
+    def test_find_pages_matches_plan(self):
+        plan = plan_build(self.content, self.static, self.docs)
+        self.assertEqual(
+            sorted(plan.page_jobs()), sorted(find_pages(self.content, self.docs))
+        )
+
+    def test_format(self):
+        text = plan_build(self.content, self.static, self.docs).format()
+        lines = text.split("\n")
+        self.assertEqual(lines[0], "Build plan: 3 page(s) (247 B), 2 asset(s) (4.0 KB)")
+        self.assertIn("200 B", lines[2])
+        self.assertIn(os.path.join(self.docs, "blog", "b", "index.html"), lines[2])
+        self.assertEqual(lines[5], "Assets (largest first):")
+        self.assertIn("4.0 KB", lines[6])
+
+    def test_largest_first_is_stable(self):
+        class Stat:
+            def __init__(self, size):
+                self.st_size = size
+
+        jobs = [("a", "", Stat(1)), ("b", "", Stat(2)), ("c", "", Stat(1))]
+        self.assertEqual([job[0] for job in largest_first(jobs)], ["b", "a", "c"])
+
+    def test_format_size(self):
+        self.assertEqual(format_size(512), "512 B")
+        self.assertEqual(format_size(1536), "1.5 KB")
+        self.assertEqual(format_size(3 << 20), "3.0 MB")
+
+
+if __name__ == "__main__":
+    unittest.main()
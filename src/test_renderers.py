@@ -0,0 +1,137 @@
+import unittest
+
+import html_emitter
+import inline_markdown
+import markdown_to_blocks
+import textnode
+from block_cache import BlockCache
+from html_emitter import markdown_to_html
+from htmlnode import LeafNode, ParentNode
+from markdown_to_blocks import BlockType, markdown_to_html_node, text_to_children
+from renderers import (
+    register_block_handler,
+    register_block_type,
+    register_inline_syntax,
+    register_text_handler,
+    register_text_type,
+)
+from textnode import TextNode, TextType
+
+
+def callout_to_html_node(lines, images=None):
+    kind = lines[0][len("> [!") : -1].lower()
+    text = " ".join(line.lstrip(">").strip() for line in lines[1:])
+    return ParentNode("aside", text_to_children(text, images), {"class": kind})
+
+
+def table_to_html_node(lines, images=None):
+    rows = []
+    for line in lines:
+        cells = [cell.strip() for cell in line.strip("|").split("|")]
+        rows.append(ParentNode("tr", [LeafNode("td", cell) for cell in cells]))
+    return ParentNode("table", rows)
+
+
+def strike_to_leaf(text_node, images=None):
+    return LeafNode("s", text_node.text)
+
+
+class TestRenderers(unittest.TestCase):
+    def setUp(self):
+        tables = [
+            markdown_to_blocks.BLOCK_DETECTORS,
+            markdown_to_blocks.BLOCK_HANDLERS,
+            html_emitter.BLOCK_EMITTERS,
+            inline_markdown.INLINE_SCANNERS,
+            textnode.TEXT_HANDLERS,
+        ]
+        saved = [dict(table) for table in tables]
+        cacheable = set(markdown_to_blocks.CACHEABLE_BLOCK_TYPES)
+
+        def restore():
+            for table, contents in zip(tables, saved):
+                table.clear()
+                table.update(contents)
+            markdown_to_blocks.CACHEABLE_BLOCK_TYPES.update(cacheable)
+            inline_markdown.markup_pattern = inline_markdown.compile_markup_pattern()
+            html_emitter.fast_inline = True
+
+        self.addCleanup(restore)
+
+    def assertRendersTo(self, markdown, expected, cache=None):
+        self.assertEqual(markdown_to_html_node(markdown, cache).to_html(), expected)
+        self.assertEqual(markdown_to_html(markdown, cache), expected)
+
+    def test_block_type_on_paragraphs(self):
+        register_block_type(
+            "table",
+            lambda lines: all(line.startswith("|") for line in lines),
+            table_to_html_node,
+        )
+        self.assertRendersTo(
+            "| a | b |\n| c | d |\n\n| not a table\ntext",
+            "<div><table><tr><td>a</td><td>b</td></tr>"
+            "<tr><td>c</td><td>d</td></tr></table><p>| not a table text</p></div>",
+        )
+
+    def test_block_type_on_quotes(self):
+        register_block_type(
+            "callout",
+            lambda lines: lines[0].startswith("> [!") and lines[0].endswith("]"),
+            callout_to_html_node,
+            base=BlockType.QUOTE,
+        )
+        self.assertRendersTo(
+            "> [!NOTE]\n> Read **this**\n\n> plain quote",
+            '<div><aside class="note">Read <b>this</b></aside>'
+            "<blockquote>plain quote</blockquote></div>",
+        )
+
+    def test_detectors_run_in_registration_order(self):
+        register_block_type("first", lambda lines: True, table_to_html_node)
+        register_block_type("second", lambda lines: True, callout_to_html_node)
+        self.assertRendersTo("|x|", "<div><table><tr><td>x</td></tr></table></div>")
+
+    def test_inline_syntax(self):
+        strike = register_text_type("strike", strike_to_leaf)
+
+        def scan_strike(text, start):
+            close = text.find("~~", start + 2)
+            if close == -1:
+                return None, None
+            return TextNode(text[start + 2 : close], strike), close + 2
+
+        register_inline_syntax("~~", scan_strike)
+        self.assertRendersTo(
+            "a ~~b~~ **c** ~~d",
+            "<div><p>a <s>b</s> <b>c</b> ~~d</p></div>",
+        )
+
+    def test_builtin_tokens_cannot_be_replaced(self):
+        with self.assertRaises(ValueError):
+            register_inline_syntax("**", lambda text, start: (None, None))
+
+    def test_override_block_handler_bypasses_cache(self):
+        cache = BlockCache()
+        self.assertRendersTo(
+            "```\nx\n```", "<div><pre><code>x\n</code></pre></div>", cache
+        )
+        register_block_handler(
+            BlockType.CODE,
+            lambda lines, images=None: LeafNode("pre", "\n".join(lines[1:-1])),
+        )
+        self.assertRendersTo("```\nx\n```", "<div><pre>x</pre></div>", cache)
+
+    def test_override_text_handler(self):
+        def nofollow_to_leaf(text_node, images=None):
+            props = {"href": text_node.url, "rel": "nofollow"}
+            return LeafNode("a", text_node.text, props)
+
+        register_text_handler(TextType.LINK, nofollow_to_leaf)
+        self.assertRendersTo(
+            "[a](/b)", '<div><p><a href="/b" rel="nofollow">a</a></p></div>'
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
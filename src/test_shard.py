@@ -0,0 +1,194 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import main
+from plan import plan_build, scan_files
+from shard import (
+    MergeError,
+    merge_shards,
+    parse_shard,
+    partition,
+    shard_plan,
+    shard_suffix,
+    write_shard_manifest,
+)
+from test_images import png
+
+
+class Stat:
+    def __init__(self, size):
+        self.st_size = size
+
+
+class TestPartition(unittest.TestCase):
+    def setUp(self):
+        self.jobs = [(f"./content/{i}.md", "", Stat(i * 10)) for i in range(40)]
+
+    def paths(self, shards):
+        return [sorted(job[0] for job in shard) for shard in shards]
+
+    def test_partition_is_deterministic_and_complete(self):
+        shards = self.paths(partition(self.jobs, 4))
+        self.assertEqual(shards, self.paths(partition(self.jobs[::-1], 4)))
+        self.assertEqual(
+            sorted(path for shard in shards for path in shard),
+            sorted(job[0] for job in self.jobs),
+        )
+        self.assertTrue(all(shards))
+        self.assertEqual(
+            [len(shard) for shard in partition([("content/0.md", "", Stat(0))], 4)],
+            [len(shard) for shard in partition([("./content//0.md", "", Stat(0))], 4)],
+        )
+
+    def test_balanced_partition_evens_out_sizes(self):
+        shards = partition(self.jobs, 4, balanced=True)
+        loads = [sum(job[2].st_size for job in shard) for shard in shards]
+        self.assertLessEqual(max(loads) - min(loads), 390)
+        self.assertEqual(
+            self.paths(shards), self.paths(partition(self.jobs[::-1], 4, True))
+        )
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for value in ["0/4", "5/4", "1/0", "x", "1/"]:
+            with self.assertRaises(ValueError):
+                parse_shard(value)
+
+
+class TestMergeShards(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.static = os.path.join(self.tmp.name, "static")
+        self.docs = os.path.join(self.tmp.name, "docs")
+        for i in range(6):
+            self.write(os.path.join(self.content, f"p{i}", "index.md"), f"# {i}\n")
+            self.write(os.path.join(self.static, "media", f"{i}.bin"), "x" * i)
+        self.shard_dirs = [os.path.join(self.tmp.name, f"shard{i}") for i in (1, 2)]
+        for index, shard_dir in enumerate(self.shard_dirs, 1):
+            self.build_shard(shard_dir, index, 2)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def build_shard(self, shard_dir, index, count):
+        plan = plan_build(self.content, self.static, shard_dir)
+        shard = shard_plan(plan, index, count)
+        for _, dest_path, _ in shard.pages + shard.assets:
+            self.write(dest_path, dest_path)
+        write_shard_manifest(plan, shard, shard_dir, index, count)
+        return shard
+
+    def merge(self, shard_dirs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return merge_shards(shard_dirs, self.docs)
+
+    def assertProblem(self, shard_dirs, message):
+        with self.assertRaises(MergeError) as raised:
+            self.merge(shard_dirs)
+        self.assertTrue(
+            any(message in problem for problem in raised.exception.problems),
+            raised.exception.problems,
+        )
+
+    def test_merge_combines_all_outputs(self):
+        copied, removed = self.merge(self.shard_dirs)
+        self.assertEqual(len(copied), 12)
+        self.assertEqual(removed, [])
+        for i in range(6):
+            page = os.path.join(self.docs, f"p{i}", "index.html")
+            media = os.path.join(self.docs, "media", f"{i}.bin")
+            self.assertTrue(os.path.exists(page))
+            self.assertTrue(os.path.exists(media))
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "shard-manifest.json")))
+
+    def test_merge_removes_stale_outputs(self):
+        stale = os.path.join(self.docs, "old", "index.html")
+        self.write(stale, "stale")
+        _, removed = self.merge(self.shard_dirs)
+        self.assertEqual(removed, [stale])
+        self.assertFalse(os.path.exists(os.path.dirname(stale)))
+        self.assertEqual(self.merge(self.shard_dirs), ([], []))
+
+    def test_missing_shard(self):
+        self.assertProblem(self.shard_dirs[:1], "missing shard(s) 2 of 2")
+
+    def test_missing_output(self):
+        for shard_dir in self.shard_dirs:
+            path = os.path.join(shard_dir, "media", "3.bin")
+            if os.path.exists(path):
+                os.remove(path)
+        self.assertProblem(self.shard_dirs, "missing output media/3.bin")
+
+    def test_collision(self):
+        self.write(os.path.join(self.shard_dirs[1], "p0", "index.html"), "")
+        self.write(os.path.join(self.shard_dirs[0], "p0", "index.html"), "")
+        self.assertProblem(self.shard_dirs, "p0/index.html is written by both")
+
+    def test_different_sources(self):
+        self.write(os.path.join(self.content, "extra.md"), "# Extra\n")
+        shutil.rmtree(self.shard_dirs[1])
+        self.build_shard(self.shard_dirs[1], 2, 2)
+        self.assertProblem(self.shard_dirs, "built from different sources")
+
+    def test_different_shard_counts(self):
+        third = os.path.join(self.tmp.name, "shard3")
+        self.build_shard(third, 2, 3)
+        self.assertProblem(
+            [self.shard_dirs[0], third], "shards disagree on the shard count"
+        )
+
+
+class TestShardedBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        self.addCleanup(self.tmp.cleanup)
+        os.makedirs(os.path.join("static", "img"))
+        for i in range(6):
+            os.makedirs(os.path.join("content", f"p{i}"))
+            with open(os.path.join("content", f"p{i}", "index.md"), "w") as f:
+                f.write(f"# Page {i}\n\n![a](/img/{i}.png)\n")
+            with open(os.path.join("static", "img", f"{i}.png"), "wb") as f:
+                f.write(png(10 + i, 20 + i))
+        with open(main.template_path, "w") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+
+    def run_main(self, *argv):
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.main(["--image-dimensions", *argv])
+
+    def read_tree(self, dir_path):
+        tree = {}
+        for path, relative_path, _ in scan_files(dir_path):
+            with open(path, "rb") as f:
+                tree[relative_path] = f.read()
+        return tree
+
+    def test_merged_shards_match_full_build(self):
+        self.run_main()
+        expected = self.read_tree(main.dir_path_docs)
+        self.assertIn(b'width="13" height="23"', expected["p3/index.html"])
+        shutil.rmtree(main.dir_path_docs)
+        for index in (1, 2):
+            self.run_main("--shard", f"{index}/2")
+        shard_dirs = [
+            f"{main.dir_path_docs}-{shard_suffix(index, 2)}" for index in (1, 2)
+        ]
+        self.run_main("--merge", *shard_dirs)
+        self.assertEqual(self.read_tree(main.dir_path_docs), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import generate_page
+from generate_page import find_title, read_lines
+from tracing import peak_rss
+
+
+class TestReadLines(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "page.md")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_split(self):
+        for text in ["", "a", "a\n", "a\n\nb", "a\r\nb\r\n", "\n\n# T\n"]:
+            with open(self.path, "w", newline="") as f:
+                f.write(text)
+            with open(self.path, "r") as f:
+                expected = f.read().split("\n")
+            self.assertEqual(list(read_lines(self.path)), expected, repr(text))
+
+    def test_find_title(self):
+        self.assertEqual(find_title(iter(["", "text", "# Title", "# Other"])), "Title")
+        with self.assertRaises(ValueError):
+            find_title(iter(["no title"]))
+
+
+class TestStreamPage(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "page.md")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        with open(self.source, "w") as f:
+            f.write("# Hello\n\nSome **text** [x](/x)\n\n- a\n- b\n\n")
+            f.write("```py\nx = 1\n```\n")
+        with open(self.template, "w") as f:
+            f.write('<title>{{ Title }}</title><a href="/">{{ Content }}</a>')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def render(self, threshold, dest_name):
+        dest_path = os.path.join(self.tmp.name, dest_name)
+        saved = generate_page.STREAM_THRESHOLD
+        generate_page.STREAM_THRESHOLD = threshold
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_page.generate_page(
+                    self.source, self.template, dest_path, "/base/"
+                )
+        finally:
+            generate_page.STREAM_THRESHOLD = saved
+        with open(dest_path) as f:
+            return f.read()
+
+    def test_streamed_output_matches(self):
+        streamed = self.render(0, "streamed.html")
+        self.assertEqual(streamed, self.render(1 << 40, "read.html"))
+
+    def test_missing_title_writes_nothing(self):
+        with open(self.source, "w") as f:
+            f.write("no title\n")
+        with self.assertRaises(ValueError):
+            self.render(0, "streamed.html")
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "streamed.html")))
+
+    def test_peak_rss(self):
+        rss = peak_rss()
+        if rss is not None:
+            self.assertGreater(rss, 1 << 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
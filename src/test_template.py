@@ -0,0 +1,52 @@
+import unittest
+
+from template import compile_template
+
+
+class TestCompileTemplate(unittest.TestCase):
+    def test_segments_and_slots(self):
+        template = compile_template(
+            "<title>{{ Title }}</title><main>{{ Content }}</main>"
+        )
+        self.assertEqual(template.segments, ["<title>", "</title><main>", "</main>"])
+        self.assertEqual(template.slots, ["title", "content"])
+
+    def test_render(self):
+        template = compile_template("<title>{{ Title }}</title>{{ Content }}")
+        self.assertEqual(
+            template.render(title="Hi", content="<p>x</p>"),
+            "<title>Hi</title><p>x</p>",
+        )
+
+    def test_repeated_placeholder(self):
+        template = compile_template("{{ Title }}|{{ Title }}")
+        self.assertEqual(template.render(title="T", content=""), "T|T")
+
+    def test_basepath_baked_into_static_segments(self):
+        template = compile_template(
+            '<link href="/index.css" />{{ Content }}', "/ssg-python/"
+        )
+        self.assertEqual(template.segments[0], '<link href="/ssg-python/index.css" />')
+
+    def test_basepath_applied_to_content(self):
+        template = compile_template("{{ Content }}", "/base/")
+        self.assertEqual(
+            template.render(title="", content='<a href="/x"><img src="/y.png"></a>'),
+            '<a href="/base/x"><img src="/base/y.png"></a>',
+        )
+
+    def test_root_basepath_leaves_urls(self):
+        template = compile_template('<a href="/x">{{ Content }}</a>')
+        self.assertEqual(template.render(title="", content=""), '<a href="/x"></a>')
+
+    def test_streamed_content(self):
+        template = compile_template("<main>{{ Content }}</main>", "/base/")
+        chunks = iter(["<p>", '<a href="/x">x</a>', "</p>"])
+        self.assertEqual(
+            template.render(title="", content=chunks),
+            '<main><p><a href="/base/x">x</a></p></main>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -188,6 +188,43 @@ class TestTextToTextNodes(unittest.TestCase):
             ],
         )
 
+    # ===== URL 内のアンダースコア =====
+    def test_underscore_in_url(self):
+        text = "![img](https://example.com/my_image_file.png) and [a_b](/c_d)"
+        result = text_to_textnodes(text)
+        self.assertEqual(
+            result,
+            [
+                TextNode("img", TextType.IMAGE, "https://example.com/my_image_file.png"),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("a_b", TextType.LINK, "/c_d"),
+            ],
+        )
+
+    # ===== コード内の区切り文字はそのまま =====
+    def test_delimiters_inside_code(self):
+        text = "call `a_b ** c` now"
+        result = text_to_textnodes(text)
+        self.assertEqual(
+            result,
+            [
+                TextNode("call ", TextType.TEXT),
+                TextNode("a_b ** c", TextType.CODE),
+                TextNode(" now", TextType.TEXT),
+            ],
+        )
+
+    # ===== リンクにならない角括弧 =====
+    def test_unmatched_brackets_stay_text(self):
+        text = "array[0] and ![not an image] here"
+        result = text_to_textnodes(text)
+        self.assertEqual(result, [TextNode(text, TextType.TEXT)])
+
+    # ===== 閉じられていない区切り文字 =====
+    def test_unclosed_delimiter_raises(self):
+        with self.assertRaises(ValueError):
+            text_to_textnodes("this is **not closed")
+
 
 if __name__ == "__main__":
     unittest.main()
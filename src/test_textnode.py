@@ -19,6 +19,14 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is a text node", TextType.BOLD, "https://www.google.com")
         self.assertNotEqual(node, node2)
 
+    def test_not_eq_other_type(self):
+        node = TextNode("This is a text node", TextType.TEXT)
+        self.assertNotEqual(node, "This is a text node")
+
+    def test_slots(self):
+        node = TextNode("This is a text node", TextType.TEXT)
+        self.assertFalse(hasattr(node, "__dict__"))
+
 
 if __name__ == "__main__":
     unittest.main()
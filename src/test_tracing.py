@@ -0,0 +1,75 @@
+import unittest
+
+import tracing
+from executors import make_executor
+from html_emitter import markdown_to_html
+from markdown_to_blocks import markdown_to_html_node
+from tracing import call_traced, span
+
+
+def traced_render(markdown):
+    return markdown_to_html_node(markdown).to_html()
+
+
+def allocate(megabytes):
+    data = bytearray(megabytes << 20)
+    data[::4096] = b"x" * len(range(0, len(data), 4096))
+    return len(data)
+
+
+class TestTracing(unittest.TestCase):
+    def tearDown(self):
+        tracing.stop_tracing()
+
+    def test_disabled_span_is_shared_noop(self):
+        self.assertIs(span("a"), span("b"))
+
+    def test_spans_are_recorded(self):
+        tracer = tracing.start_tracing()
+        markdown_to_html_node("# Title\n\nsome **text**")
+        names = [event[0] for event in tracer.events]
+        self.assertIn("markdown_parse", names)
+        self.assertEqual(names.count("block_conversion"), 2)
+        self.assertEqual(names.count("inline_parse"), 2)
+
+    def test_emitter_spans_are_recorded(self):
+        tracer = tracing.start_tracing()
+        markdown_to_html("# Title\n\nsome **text**")
+        names = [event[0] for event in tracer.events]
+        self.assertIn("markdown_parse", names)
+        self.assertEqual(names.count("block_conversion"), 2)
+        self.assertEqual(names.count("inline_parse"), 2)
+
+    def test_chrome_trace_format(self):
+        tracer = tracing.start_tracing()
+        with span("outer", {"path": "a.md"}):
+            with span("inner"):
+                pass
+        events = tracer.to_chrome_trace()["traceEvents"]
+        self.assertEqual([event["name"] for event in events], ["outer", "inner"])
+        outer, inner = events
+        self.assertEqual(outer["ph"], "X")
+        self.assertEqual(outer["args"], {"path": "a.md"})
+        self.assertGreaterEqual(inner["ts"], outer["ts"])
+        self.assertLessEqual(inner["dur"], outer["dur"])
+
+    def test_process_workers_return_their_events(self):
+        tracer = tracing.start_tracing()
+        with make_executor("process", 2) as executor:
+            future = executor.submit(call_traced, traced_render, "# T\n\ntext")
+            html, events = future.result()
+        self.assertEqual(html, "<div><h1>T</h1><p>text</p></div>")
+        tracer.merge(events)
+        self.assertIn("markdown_parse", [event[0] for event in tracer.events])
+
+    def test_peak_rss_counts_finished_workers(self):
+        if tracing.peak_rss() is None:
+            self.skipTest("resource module is not available")
+        before = tracing.peak_rss()
+        with make_executor("process", 1) as executor:
+            executor.submit(allocate, before >> 20).result()
+        self.assertGreater(tracing.peak_rss(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import main
+from executors import SerialExecutor
+from manifest import BuildManifest
+from watch import changed_paths, snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        os.makedirs(os.path.join(self.content, "blog"))
+        self.write(os.path.join(self.content, "index.md"), "# Home")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog")
+        self.write(self.template, "{{ Content }}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        with open(path, "w") as f:
+            f.write(text)
+
+    def test_snapshot_lists_files(self):
+        files = snapshot([self.content, self.template])
+        self.assertEqual(
+            sorted(files),
+            sorted(
+                [
+                    os.path.join(self.content, "index.md"),
+                    os.path.join(self.content, "blog", "index.md"),
+                    self.template,
+                ]
+            ),
+        )
+
+    def test_missing_paths_are_ignored(self):
+        self.assertEqual(snapshot([os.path.join(self.tmp.name, "static")]), {})
+
+    def test_changed_paths(self):
+        before = snapshot([self.content, self.template])
+        self.write(os.path.join(self.content, "index.md"), "# Home, edited")
+        os.remove(os.path.join(self.content, "blog", "index.md"))
+        self.write(os.path.join(self.content, "new.md"), "# New")
+        after = snapshot([self.content, self.template])
+        self.assertEqual(
+            changed_paths(before, after),
+            {
+                os.path.join(self.content, "index.md"),
+                os.path.join(self.content, "blog", "index.md"),
+                os.path.join(self.content, "new.md"),
+            },
+        )
+
+    def test_no_changes(self):
+        before = snapshot([self.content, self.template])
+        self.assertEqual(changed_paths(before, dict(before)), set())
+
+
+class TestRebuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        self.addCleanup(self.tmp.cleanup)
+        os.makedirs("content")
+        os.makedirs("static")
+        self.write(os.path.join("content", "index.md"), "# Home\n\nHello")
+        self.write(main.template_path, "<title>{{ Title }}</title>{{ Content }}")
+        self.args = main.make_parser().parse_args(["--watch"])
+        self.manifest = BuildManifest.load(main.manifest_path)
+        self.executor = SerialExecutor()
+
+    def write(self, path, text):
+        with open(path, "w") as f:
+            f.write(text)
+
+    def read_index(self):
+        with open(os.path.join(main.dir_path_docs, "index.html")) as f:
+            return f.read()
+
+    def rebuild(self, changed):
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.rebuild(self.args, self.manifest, self.executor, None, changed)
+
+    def test_template_change_rerenders_pages(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(main.build(self.args, self.manifest, self.executor))
+        self.assertTrue(self.read_index().startswith("<title>Home</title>"))
+        self.write(main.template_path, "<h1>{{ Title }}</h1><main>{{ Content }}</main>")
+        self.rebuild({main.template_path})
+        self.assertTrue(self.read_index().startswith("<h1>Home</h1><main>"))
+
+    def test_page_change_rerenders_page(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.build(self.args, self.manifest, self.executor)
+        path = os.path.join(main.dir_path_content, "index.md")
+        self.write(path, "# Home\n\nEdited")
+        self.rebuild({path})
+        self.assertIn("<p>Edited</p>", self.read_index())
+
+    def test_image_dimensions_survive_page_rebuilds(self):
+        with open(os.path.join("static", "a.gif"), "wb") as f:
+            f.write(b"GIF89a" + (3).to_bytes(2, "little") + (2).to_bytes(2, "little"))
+        self.args = main.make_parser().parse_args(["--watch", "--image-dimensions"])
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.build(self.args, self.manifest, self.executor)
+        path = os.path.join(main.dir_path_content, "index.md")
+        self.write(path, "# Home\n\n![a](/a.gif)")
+        self.rebuild({path})
+        self.assertIn('width="3" height="2"', self.read_index())
+
+
+if __name__ == "__main__":
+    unittest.main()
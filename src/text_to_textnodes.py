@@ -1,12 +1,3 @@
-from textnode import TextNode, TextType
-from split_nodes import split_nodes_delimiter, split_nodes_images, split_nodes_links
+from inline_markdown import text_to_textnodes
 
-
-def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_images(nodes)
-    nodes = split_nodes_links(nodes)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    return nodes
+__all__ = ["text_to_textnodes"]
@@ -12,12 +12,16 @@ class TextType(Enum):
 
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
         self.text_type = text_type
         self.url = url
 
     def __eq__(self, other):
+        if not isinstance(other, TextNode):
+            return NotImplemented
         return (
             self.text_type == other.text_type
             and self.text == other.text
@@ -28,17 +32,44 @@ class TextNode:
         return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
 
 
-def text_node_to_html_node(text_node):
-    if text_node.text_type == TextType.TEXT:
-        return LeafNode(None, text_node.text)
-    if text_node.text_type == TextType.BOLD:
-        return LeafNode("b", text_node.text)
-    if text_node.text_type == TextType.ITALIC:
-        return LeafNode("i", text_node.text)
-    if text_node.text_type == TextType.CODE:
-        return LeafNode("code", text_node.text)
-    if text_node.text_type == TextType.LINK:
-        return LeafNode("a", text_node.text, {"href": text_node.url})
-    if text_node.text_type == TextType.IMAGE:
-        return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
-    raise ValueError(f"invalid text type: {text_node.text_type}")
+def text_node_to_html_node(text_node, images=None):
+    handler = TEXT_HANDLERS.get(text_node.text_type)
+    if handler is None:
+        raise ValueError(f"invalid text type: {text_node.text_type}")
+    return handler(text_node, images)
+
+
+def text_to_leaf(text_node, images=None):
+    return LeafNode(None, text_node.text)
+
+
+def bold_to_leaf(text_node, images=None):
+    return LeafNode("b", text_node.text)
+
+
+def italic_to_leaf(text_node, images=None):
+    return LeafNode("i", text_node.text)
+
+
+def code_to_leaf(text_node, images=None):
+    return LeafNode("code", text_node.text)
+
+
+def link_to_leaf(text_node, images=None):
+    return LeafNode("a", text_node.text, {"href": text_node.url})
+
+
+def image_to_leaf(text_node, images=None):
+    if images is not None:
+        return LeafNode("img", "", images.props(text_node.url, text_node.text))
+    return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
+
+
+TEXT_HANDLERS = {
+    TextType.TEXT: text_to_leaf,
+    TextType.BOLD: bold_to_leaf,
+    TextType.ITALIC: italic_to_leaf,
+    TextType.CODE: code_to_leaf,
+    TextType.LINK: link_to_leaf,
+    TextType.IMAGE: image_to_leaf,
+}
@@ -0,0 +1,139 @@
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+tracer = None
+
+
+class Tracer:
+    def __init__(self):
+        self.pid = os.getpid()
+        self.events = []
+
+    def span(self, name, args=None):
+        return Span(self, name, args)
+
+    def merge(self, events):
+        if events:
+            self.events.extend(events)
+
+    def to_chrome_trace(self):
+        trace_events = []
+        for name, start_ns, end_ns, pid, tid, args in self.events:
+            event = {
+                "name": name,
+                "cat": "build",
+                "ph": "X",
+                "ts": start_ns / 1000,
+                "dur": (end_ns - start_ns) / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            trace_events.append(event)
+        trace_events.sort(key=lambda event: (event["pid"], event["tid"], event["ts"]))
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+class Span:
+    __slots__ = ("tracer", "name", "args", "start_ns")
+
+    def __init__(self, tracer, name, args=None):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start_ns = 0
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns()
+        self.tracer.events.append(
+            (
+                self.name,
+                self.start_ns,
+                end_ns,
+                self.tracer.pid,
+                threading.get_ident(),
+                self.args,
+            )
+        )
+        return False
+
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+null_span = NullSpan()
+
+
+def span(name, args=None):
+    if tracer is None:
+        return null_span
+    return tracer.span(name, args)
+
+
+def enabled():
+    return tracer is not None
+
+
+def start_tracing():
+    global tracer
+    tracer = Tracer()
+    return tracer
+
+
+def stop_tracing():
+    global tracer
+    stopped = tracer
+    tracer = None
+    return stopped
+
+
+def merge_events(events):
+    if tracer is not None:
+        tracer.merge(events)
+
+
+def call_traced(fn, *args):
+    if tracer is not None and tracer.pid == os.getpid():
+        return fn(*args), None
+    local_tracer = start_tracing()
+    try:
+        result = fn(*args)
+    finally:
+        stop_tracing()
+    return result, local_tracer.events
+
+
+def peak_rss():
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    if sys.platform == "darwin":
+        return peak
+    return peak * 1024
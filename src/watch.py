@@ -0,0 +1,58 @@
+import os
+import time
+
+
+def snapshot(paths):
+    files = {}
+    for path in paths:
+        if os.path.isdir(path):
+            scan_dir(path, files)
+        elif os.path.exists(path):
+            stat = os.stat(path)
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def scan_dir(dir_path, files):
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                scan_dir(entry.path, files)
+            elif entry.is_file():
+                stat = entry.stat()
+                files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+
+def changed_paths(before, after):
+    changed = set()
+    for path, state in after.items():
+        if before.get(path) != state:
+            changed.add(path)
+    for path in before:
+        if path not in after:
+            changed.add(path)
+    return changed
+
+
+def wait_for_changes(paths, previous, interval=0.5, debounce=0.2):
+    while True:
+        time.sleep(interval)
+        current = snapshot(paths)
+        if current != previous:
+            break
+    while True:
+        time.sleep(debounce)
+        latest = snapshot(paths)
+        if latest == current:
+            return current
+        current = latest
+
+
+def watch(paths, on_change, interval=0.5, debounce=0.2):
+    previous = snapshot(paths)
+    while True:
+        current = wait_for_changes(paths, previous, interval, debounce)
+        changed = changed_paths(previous, current)
+        previous = current
+        if changed:
+            on_change(changed)